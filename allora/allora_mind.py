@@ -669,25 +669,22 @@ class AlloraMind:
         processed_dir = os.path.join(self.project_root, "tmp", "commands", "processed")
         failed_dir = os.path.join(self.project_root, "tmp", "commands", "failed")
 
-        # Ensure directories exist
-        os.makedirs(processed_dir, exist_ok=True)
-        os.makedirs(failed_dir, exist_ok=True)
-        
-        if not os.path.exists(command_dir):
+        # One scandir pass; in-flight "<id>.json.tmp" files are left alone
+        try:
+            with os.scandir(command_dir) as entries:
+                command_files = sorted(entry.name for entry in entries if entry.name.endswith('.json'))
+        except FileNotFoundError:
             return
-
-        # Sort to process in FIFO order
-        command_files = sorted(os.listdir(command_dir))
         if not command_files:
             return
 
+        # Ensure directories exist
+        os.makedirs(processed_dir, exist_ok=True)
+        os.makedirs(failed_dir, exist_ok=True)
+
         print(f"🤖 Found {len(command_files)} pending command(s) in queue...")
         for filename in command_files:
             filepath = os.path.join(command_dir, filename)
-            if not filename.endswith('.json'):
-                print(f"  - Skipping non-json file: {filename}")
-                continue
-            
             destination_dir = failed_dir
             try:
                 with open(filepath, "r") as f:
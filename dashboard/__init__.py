@@ -0,0 +1,3 @@
+"""
+HyperLiquid AI Trading Bot Dashboard
+"""
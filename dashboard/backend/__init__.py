@@ -0,0 +1,3 @@
+"""
+Dashboard Backend - FastAPI application, routers, controllers and services
+"""
@@ -7,13 +7,14 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 import asyncio
-import json
 import logging
 from datetime import datetime
 from typing import Dict, Any
 import sys
 import os
 
+import orjson
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
@@ -139,7 +140,7 @@ async def websocket_endpoint(websocket: WebSocket):
     
     try:
         # Send initial connection confirmation
-        await websocket.send_json({
+        await websocket_manager.send_to_client(client_id, {
             "type": "connection",
             "status": "connected",
             "client_id": client_id,
@@ -148,7 +149,7 @@ async def websocket_endpoint(websocket: WebSocket):
         
         # Send initial data snapshot
         initial_data = await data_service.get_dashboard_snapshot()
-        await websocket.send_json({
+        await websocket_manager.send_to_client(client_id, {
             "type": "snapshot",
             "data": initial_data,
             "timestamp": datetime.now().isoformat()
@@ -159,10 +160,10 @@ async def websocket_endpoint(websocket: WebSocket):
             try:
                 # Wait for client messages (ping/pong for keep-alive)
                 data = await websocket.receive_text()
-                message = json.loads(data)
+                message = orjson.loads(data)
                 
                 if message.get("type") == "ping":
-                    await websocket.send_json({
+                    await websocket_manager.send_to_client(client_id, {
                         "type": "pong",
                         "timestamp": datetime.now().isoformat()
                     })
@@ -189,7 +190,7 @@ async def websocket_endpoint(websocket: WebSocket):
                     fresh_snapshot = await data_service.get_dashboard_snapshot()
                     
                     # Send complete state sync response
-                    await websocket.send_json({
+                    await websocket_manager.send_to_client(client_id, {
                         "type": "snapshot",
                         "data": fresh_snapshot,
                         "timestamp": datetime.now().isoformat()
@@ -201,7 +202,10 @@ async def websocket_endpoint(websocket: WebSocket):
                 break
             except Exception as e:
                 logger.error(f"WebSocket message handling error: {e}")
-                await websocket.send_json({
+                if client_id not in websocket_manager.active_connections:
+                    # A failed send already dropped this client
+                    break
+                await websocket_manager.send_to_client(client_id, {
                     "type": "error",
                     "message": str(e),
                     "timestamp": datetime.now().isoformat()
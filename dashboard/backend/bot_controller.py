@@ -6,13 +6,8 @@ Key component for resolving dashboard state sync issues
 
 import logging
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import asyncio
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from dashboard.backend.controllers.bot_process_controller import BotProcessController
 from dashboard.backend.controllers.bot_mode_controller import BotModeController
@@ -372,7 +367,7 @@ class BotController:
     
     # ===== STATE SYNCHRONIZATION METHODS =====
     
-    async def send_full_state_sync(self, client_id: str = None):
+    async def send_full_state_sync(self, client_id: Optional[int] = None):
         """Send full state sync to dashboard client(s)"""
         if self.state_sync_service:
             return await self.state_sync_service.send_full_state_sync(client_id)
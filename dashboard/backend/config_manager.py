@@ -7,13 +7,9 @@ import asyncio
 import logging
 import json
 import requests
+import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from database.db_manager import DatabaseManager
 from scripts.check_allora_topics import get_allora_topics
@@ -23,12 +19,21 @@ logger = logging.getLogger(__name__)
 class ConfigManager:
     """Manages cryptocurrency configuration and availability"""
     
+    # Seconds get_available_cryptos serves the loaded availability before
+    # fetching the HyperLiquid universe again
+    AVAILABILITY_MAX_AGE = 60.0
+    
     def __init__(self):
         self.db = DatabaseManager()
         self.active_cryptos = {}  # {symbol: topic_id}
         self.available_cryptos = {}  # Complete availability data
+        self._availability_loaded_at = float("-inf")  # time.monotonic()
         self.hyperliquid_info = None
         
+        # Bumped whenever crypto availability/activation changes, so derived
+        # responses can be cached per status version
+        self.status_version = 0
+        
         # Initialize with existing active cryptos from database
         self._load_active_cryptos()
         
@@ -65,13 +70,20 @@ class ConfigManager:
             allora_tokens = self._get_allora_tokens()
             
             # Cross-reference availability
-            self.available_cryptos = self._cross_reference_availability(
+            available_cryptos = self._cross_reference_availability(
                 hyperliquid_tokens, allora_tokens
             )
+            changed = available_cryptos != self.available_cryptos
+            self.available_cryptos = available_cryptos
+            self._availability_loaded_at = time.monotonic()
             
             # Update database with availability data
             await self._update_availability_in_db()
             
+            # Only a real change invalidates version-keyed caches/ETags
+            if changed:
+                self.status_version += 1
+            
             logger.info(f"Loaded {len(self.available_cryptos)} available cryptos")
             return self.available_cryptos
             
@@ -79,6 +91,13 @@ class ConfigManager:
             logger.error(f"Error loading available cryptos: {e}")
             return {}
     
+    async def get_available_cryptos(self) -> Dict[str, Any]:
+        """Availability data, reloaded at most once per AVAILABILITY_MAX_AGE seconds"""
+        if (self.available_cryptos and
+                time.monotonic() - self._availability_loaded_at < self.AVAILABILITY_MAX_AGE):
+            return self.available_cryptos
+        return await self.load_available_cryptos()
+    
     async def _get_hyperliquid_tokens(self) -> List[str]:
         """Get available tokens from HyperLiquid testnet"""
         try:
@@ -162,18 +181,19 @@ class ConfigManager:
     
     async def _update_availability_in_db(self):
         """Update crypto availability data in database"""
-        for symbol, data in self.available_cryptos.items():
-            try:
-                self.db.update_crypto_config(
-                    symbol=symbol,
-                    topic_id=data['topic_id'] or 0,
-                    is_active=data['is_active'],
-                    availability=data['availability'],
-                    hyperliquid_available=data['hyperliquid_available'],
-                    allora_available=data['allora_available']
-                )
-            except Exception as e:
-                logger.error(f"Error updating DB for {symbol}: {e}")
+        rows = [
+            {
+                'symbol': symbol,
+                'topic_id': data['topic_id'] or 0,
+                'is_active': data['is_active'],
+                'availability': data['availability'],
+                'hyperliquid_available': data['hyperliquid_available'],
+                'allora_available': data['allora_available']
+            }
+            for symbol, data in self.available_cryptos.items()
+        ]
+        # One transaction for the whole universe; errors are logged by the DB layer
+        self.db.bulk_upsert_crypto_configs(rows)
     
     async def get_crypto_status(self) -> Dict[str, Any]:
         """Get complete crypto status for dashboard"""
@@ -198,31 +218,38 @@ class ConfigManager:
         
         return status
     
+    def _validation_error(self, symbol: str, should_activate: bool) -> Optional[str]:
+        """Why symbol can't be activated/deactivated, or None if it can"""
+        if should_activate:
+            crypto_data = self.available_cryptos.get(symbol)
+            if crypto_data is None:
+                return f"Crypto {symbol} not available on any platform"
+            # Trading needs an Allora topic ID for predictions
+            if not crypto_data['allora_available']:
+                return f"Crypto {symbol} not available on AlloraNetwork (no trading predictions)"
+        elif symbol not in self.active_cryptos:
+            return f"Crypto {symbol} is not currently active"
+        return None
+    
     async def activate_crypto(self, symbol: str) -> Dict[str, Any]:
         """Activate a cryptocurrency for monitoring"""
         try:
-            # Validate crypto exists and is available
-            if symbol not in self.available_cryptos:
+            error = self._validation_error(symbol, True)
+            if error:
                 return {
                     'success': False,
-                    'message': f"Crypto {symbol} not available on any platform"
+                    'message': error
                 }
             
             crypto_data = self.available_cryptos[symbol]
             
-            # Check if it has Allora topic ID for trading
-            if not crypto_data['allora_available']:
-                return {
-                    'success': False,
-                    'message': f"Crypto {symbol} not available on AlloraNetwork (no trading predictions)"
-                }
-            
             # Activate in database
             success = self.db.activate_crypto(symbol)
             
             if success:
                 # Update local cache
                 self.active_cryptos[symbol] = crypto_data['topic_id']
+                self.status_version += 1
                 
                 # Add bot command for real-time update
                 self.db.add_bot_command('ACTIVATE_CRYPTO', {'symbol': symbol, 'topic_id': crypto_data['topic_id']})
@@ -249,11 +276,11 @@ class ConfigManager:
     async def deactivate_crypto(self, symbol: str) -> Dict[str, Any]:
         """Deactivate a cryptocurrency from monitoring"""
         try:
-            # Check if crypto is currently active
-            if symbol not in self.active_cryptos:
+            error = self._validation_error(symbol, False)
+            if error:
                 return {
                     'success': False,
-                    'message': f"Crypto {symbol} is not currently active"
+                    'message': error
                 }
             
             # Deactivate in database
@@ -262,6 +289,7 @@ class ConfigManager:
             if success:
                 # Remove from local cache
                 topic_id = self.active_cryptos.pop(symbol, None)
+                self.status_version += 1
                 
                 # Add bot command for real-time update
                 self.db.add_bot_command('DEACTIVATE_CRYPTO', {'symbol': symbol})
@@ -293,29 +321,38 @@ class ConfigManager:
             'errors': []
         }
         
+        # Validate every update first (same rules as activate/deactivate_crypto)
+        pending = {}
         for symbol, should_activate in updates.items():
-            try:
-                if should_activate:
-                    result = await self.activate_crypto(symbol)
-                    if result['success']:
-                        results['activated'].append(symbol)
-                    else:
-                        results['errors'].append(f"{symbol}: {result['message']}")
-                        results['success'] = False
-                else:
-                    result = await self.deactivate_crypto(symbol)
-                    if result['success']:
-                        results['deactivated'].append(symbol)
-                    else:
-                        results['errors'].append(f"{symbol}: {result['message']}")
-                        results['success'] = False
-                        
-            except Exception as e:
-                results['errors'].append(f"{symbol}: {str(e)}")
+            error = self._validation_error(symbol, should_activate)
+            if error:
+                results['errors'].append(f"{symbol}: {error}")
                 results['success'] = False
+            else:
+                pending[symbol] = bool(should_activate)
+        
+        # Apply all valid updates in a single database transaction
+        try:
+            updated = set(self.db.set_cryptos_active(pending))
+        except Exception as e:
+            logger.error(f"Error in batch crypto update: {e}")
+            updated = set()
+        
+        for symbol, should_activate in pending.items():
+            action = "activate" if should_activate else "deactivate"
+            if symbol not in updated:
+                results['errors'].append(f"{symbol}: Failed to {action} crypto {symbol}")
+                results['success'] = False
+            elif should_activate:
+                self.active_cryptos[symbol] = self.available_cryptos[symbol]['topic_id']
+                results['activated'].append(symbol)
+            else:
+                self.active_cryptos.pop(symbol, None)
+                results['deactivated'].append(symbol)
         
-        # Add batch command for bot
+        # Add batch command for bot (the bot reloads active cryptos from the database)
         if results['activated'] or results['deactivated']:
+            self.status_version += 1
             self.db.add_bot_command('BATCH_UPDATE_CRYPTOS', {
                 'activated': results['activated'],
                 'deactivated': results['deactivated']
@@ -7,11 +7,6 @@ Extracted from bot_controller.py for better maintainability (≤350 lines)
 import logging
 from datetime import datetime
 from typing import Dict, Any
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from dashboard.backend.config_manager import ConfigManager
 
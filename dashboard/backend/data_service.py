@@ -7,18 +7,39 @@ import sqlite3
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import json
-import sys
 import asyncio
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from dataclasses import dataclass, fields
 
 from dashboard.backend.bot_controller import BotController
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class TradeRow:
+    """Compact trade record used by the in-memory trade filters
+    
+    Field order matches the trade SELECT column order, so rows can be
+    built with TradeRow(*row).
+    """
+    id: int
+    timestamp: Optional[str]
+    coin: Optional[str]
+    side: Optional[str]
+    size: Optional[float]
+    price: Optional[float]
+    pnl: Optional[float]
+    prediction_confidence: Optional[float]
+    ai_reasoning: Optional[str]
+    created_at: Optional[str]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the trade dict shape returned by the API"""
+        return {name: getattr(self, name) for name in TRADE_FIELDS}
+
+TRADE_FIELDS = tuple(field.name for field in fields(TradeRow))
+
 class DataService:
     """Service layer for accessing trading data and analytics"""
     
@@ -227,6 +248,10 @@ class DataService:
     
     async def get_recent_trades(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get recent trades"""
+        return [trade.to_dict() for trade in await self.get_recent_trade_rows(limit)]
+    
+    async def get_recent_trade_rows(self, limit: int = 20) -> List[TradeRow]:
+        """Get recent trades as compact TradeRow records"""
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
@@ -240,27 +265,73 @@ class DataService:
                     LIMIT ?
                 """, (limit,))
                 
-                trades = []
-                for row in cursor.fetchall():
-                    trades.append({
-                        "id": row[0],
-                        "timestamp": row[1],
-                        "coin": row[2],
-                        "side": row[3],
-                        "size": row[4],
-                        "price": row[5],
-                        "pnl": row[6],
-                        "prediction_confidence": row[7],
-                        "ai_reasoning": row[8],
-                        "created_at": row[9]
-                    })
-                
-                return trades
+                return [TradeRow(*row) for row in cursor.fetchall()]
                 
         except Exception as e:
             logger.error(f"Error getting recent trades: {e}")
             return []
     
+    # Sortable trade columns and the value used in place of NULL when sorting
+    TRADE_SORT_COLUMNS = {"timestamp": "''", "pnl": "0", "size": "0"}
+    
+    async def query_trades(
+        self,
+        symbol: Optional[str] = None,
+        side: Optional[str] = None,
+        sort_by: str = "timestamp",
+        descending: bool = True,
+        limit: int = 10,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Get one filtered/sorted page of trades plus the total matching count"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                
+                conditions = []
+                params: List[Any] = []
+                if symbol:
+                    conditions.append("UPPER(coin) = ?")
+                    params.append(symbol.upper())
+                if side:
+                    conditions.append("UPPER(side) = ?")
+                    params.append(side.upper())
+                where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+                
+                # Column names come from a fixed whitelist, never from user input
+                direction = "DESC" if descending else "ASC"
+                if sort_by in self.TRADE_SORT_COLUMNS:
+                    order_clause = f"COALESCE({sort_by}, {self.TRADE_SORT_COLUMNS[sort_by]}) {direction}, created_at DESC, id DESC"
+                else:
+                    order_clause = "created_at DESC, id DESC"
+                
+                # COUNT(*) OVER () returns the total match count alongside the page
+                cursor.execute(f"""
+                    SELECT 
+                        id, timestamp, coin, side, size, price, pnl, 
+                        prediction_confidence, ai_reasoning, created_at,
+                        COUNT(*) OVER () AS total_count
+                    FROM trades
+                    {where_clause}
+                    ORDER BY {order_clause}
+                    LIMIT ? OFFSET ?
+                """, (*params, limit, offset))
+                
+                rows = cursor.fetchall()
+                if rows:
+                    total_count = rows[0][10]
+                else:
+                    # Past the last page the window count is unavailable
+                    cursor.execute(f"SELECT COUNT(*) FROM trades {where_clause}", params)
+                    total_count = cursor.fetchone()[0]
+                
+                trades = [TradeRow(*row[:10]).to_dict() for row in rows]
+                return trades, total_count
+                
+        except Exception as e:
+            logger.error(f"Error querying trades: {e}")
+            return [], 0
+    
     async def get_current_positions(self) -> List[Dict[str, Any]]:
         """Get current positions"""
         try:
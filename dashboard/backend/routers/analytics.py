@@ -7,11 +7,6 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Dict, Any, Optional
 import logging
 from datetime import datetime, timedelta
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from dashboard.backend.data_service import DataService
 
@@ -6,11 +6,6 @@ Endpoints for managing the trading bot lifecycle
 from fastapi import APIRouter, HTTPException, Depends
 from typing import Dict, Any
 import logging
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from dashboard.backend.bot_controller import BotController
 
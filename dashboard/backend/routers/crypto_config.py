@@ -3,15 +3,13 @@ Crypto Configuration API Router
 Provides endpoints for managing cryptocurrency configurations
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, List, Any
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Dict, List, Any, Optional, Tuple
 import logging
+import uuid
+import orjson
 from pydantic import BaseModel
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from dashboard.backend.config_manager import ConfigManager
 
@@ -50,16 +48,62 @@ class ApiResponse(BaseModel):
     message: str
     data: Any = None
 
-# Dependency to get config manager
-async def get_config_manager() -> ConfigManager:
-    return config_manager
+# Clients can opt into streamed JSON-lines listings via the Accept header
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def _wants_ndjson(request: Request) -> bool:
+    """Check whether the client asked for an NDJSON stream"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+def _ndjson_response(cryptos: List[Dict[str, Any]]) -> StreamingResponse:
+    """Stream cryptos one JSON document per line, with the total in a header"""
+    def generate():
+        for crypto in cryptos:
+            yield orjson.dumps(crypto) + b"\n"
+    
+    return StreamingResponse(
+        generate(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"X-Total-Count": str(len(cryptos))}
+    )
+
+# Polled listings may be reused briefly by the browser, then revalidated via ETag
+POLL_CACHE_CONTROL = "private, max-age=15"
+
+# status_version restarts at 0 with the process; tagging ETags with a per-process
+# id keeps a tag cached before a restart from matching a different state
+_ETAG_EPOCH = uuid.uuid4().hex[:12]
 
-@router.get("/available", response_model=Dict[str, Any])
-async def get_available_cryptos(manager: ConfigManager = Depends(get_config_manager)):
+def _cache_headers(version: int, size: int) -> Dict[str, str]:
+    """Build weak ETag/Cache-Control headers for a status-versioned response"""
+    return {"ETag": f'W/"{_ETAG_EPOCH}-{version}-{size}"', "Cache-Control": POLL_CACHE_CONTROL}
+
+def _is_not_modified(request: Request, etag: str) -> bool:
+    """Check the client's If-None-Match header against the current ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+@router.get("/available", response_class=ORJSONResponse)
+async def get_available_cryptos(request: Request, response: Response):
     """Get list of all available cryptocurrencies across platforms"""
     try:
-        # Load latest availability data
-        available_cryptos = await manager.load_available_cryptos()
+        # Availability snapshot, refetched from HyperLiquid only once it is
+        # AVAILABILITY_MAX_AGE old, so a revalidation usually costs no outbound call
+        available_cryptos = await config_manager.get_available_cryptos()
+        
+        # Unchanged availability: skip serialization and payload transfer
+        headers = _cache_headers(config_manager.status_version, len(available_cryptos))
+        if _is_not_modified(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        
+        if _wants_ndjson(request):
+            streaming_response = _ndjson_response(list(available_cryptos.values()))
+            streaming_response.headers.update(headers)
+            return streaming_response
         
         return {
             "success": True,
@@ -67,7 +111,7 @@ async def get_available_cryptos(manager: ConfigManager = Depends(get_config_mana
             "data": {
                 "total_count": len(available_cryptos),
                 "cryptos": list(available_cryptos.values()),
-                "last_updated": manager.last_updated if hasattr(manager, 'last_updated') else None
+                "last_updated": config_manager.last_updated if hasattr(config_manager, 'last_updated') else None
             }
         }
     except Exception as e:
@@ -75,10 +119,10 @@ async def get_available_cryptos(manager: ConfigManager = Depends(get_config_mana
         raise HTTPException(status_code=500, detail=f"Error loading available cryptocurrencies: {str(e)}")
 
 @router.get("/active", response_model=Dict[str, Any])
-async def get_active_cryptos(manager: ConfigManager = Depends(get_config_manager)):
+async def get_active_cryptos():
     """Get list of currently active/monitored cryptocurrencies"""
     try:
-        active_cryptos = manager.get_active_cryptos_for_bot()
+        active_cryptos = config_manager.get_active_cryptos_for_bot()
         
         return {
             "success": True,
@@ -92,11 +136,11 @@ async def get_active_cryptos(manager: ConfigManager = Depends(get_config_manager
         logger.error(f"Error getting active cryptos: {e}")
         raise HTTPException(status_code=500, detail=f"Error retrieving active cryptocurrencies: {str(e)}")
 
-@router.get("/status", response_model=Dict[str, Any])
-async def get_crypto_status(manager: ConfigManager = Depends(get_config_manager)):
+@router.get("/status", response_class=ORJSONResponse)
+async def get_crypto_status():
     """Get complete crypto status including availability breakdown"""
     try:
-        status = await manager.get_crypto_status()
+        status = await config_manager.get_crypto_status()
         
         return {
             "success": True,
@@ -108,10 +152,10 @@ async def get_crypto_status(manager: ConfigManager = Depends(get_config_manager)
         raise HTTPException(status_code=500, detail=f"Error retrieving crypto status: {str(e)}")
 
 @router.post("/activate", response_model=ApiResponse)
-async def activate_crypto(request: CryptoActivationRequest, manager: ConfigManager = Depends(get_config_manager)):
+async def activate_crypto(request: CryptoActivationRequest):
     """Activate a cryptocurrency for monitoring"""
     try:
-        result = await manager.activate_crypto(request.symbol)
+        result = await config_manager.activate_crypto(request.symbol)
         
         if result['success']:
             return ApiResponse(
@@ -133,10 +177,10 @@ async def activate_crypto(request: CryptoActivationRequest, manager: ConfigManag
         raise HTTPException(status_code=500, detail=f"Error activating cryptocurrency: {str(e)}")
 
 @router.post("/deactivate", response_model=ApiResponse)
-async def deactivate_crypto(request: CryptoDeactivationRequest, manager: ConfigManager = Depends(get_config_manager)):
+async def deactivate_crypto(request: CryptoDeactivationRequest):
     """Deactivate a cryptocurrency from monitoring"""
     try:
-        result = await manager.deactivate_crypto(request.symbol)
+        result = await config_manager.deactivate_crypto(request.symbol)
         
         if result['success']:
             return ApiResponse(
@@ -157,10 +201,10 @@ async def deactivate_crypto(request: CryptoDeactivationRequest, manager: ConfigM
         raise HTTPException(status_code=500, detail=f"Error deactivating cryptocurrency: {str(e)}")
 
 @router.put("/batch-update", response_model=ApiResponse)
-async def batch_update_cryptos(request: BatchUpdateRequest, manager: ConfigManager = Depends(get_config_manager)):
+async def batch_update_cryptos(request: BatchUpdateRequest):
     """Batch update multiple cryptocurrency activations"""
     try:
-        result = await manager.batch_update_cryptos(request.updates)
+        result = await config_manager.batch_update_cryptos(request.updates)
         
         return ApiResponse(
             success=result['success'],
@@ -178,10 +222,10 @@ async def batch_update_cryptos(request: BatchUpdateRequest, manager: ConfigManag
         raise HTTPException(status_code=500, detail=f"Error in batch update: {str(e)}")
 
 @router.get("/compatibility", response_model=Dict[str, Any])
-async def get_compatibility_check(manager: ConfigManager = Depends(get_config_manager)):
+async def get_compatibility_check():
     """Check compatibility between HyperLiquid and AlloraNetwork"""
     try:
-        compatibility = await manager.get_compatibility_check()
+        compatibility = await config_manager.get_compatibility_check()
         
         return {
             "success": True,
@@ -192,17 +236,17 @@ async def get_compatibility_check(manager: ConfigManager = Depends(get_config_ma
         logger.error(f"Error in compatibility check: {e}")
         raise HTTPException(status_code=500, detail=f"Error checking compatibility: {str(e)}")
 
-@router.get("/search", response_model=Dict[str, Any])
+@router.get("/search", response_class=ORJSONResponse)
 async def search_cryptos(
+    request: Request,
     query: str = "",
     availability: str = "all",  # "all", "both", "hyperliquid", "allora"
-    active_only: bool = False,
-    manager: ConfigManager = Depends(get_config_manager)
+    active_only: bool = False
 ):
     """Search and filter cryptocurrencies"""
     try:
         # Get crypto status
-        status = await manager.get_crypto_status()
+        status = await config_manager.get_crypto_status()
         cryptos = status['cryptos']
         
         # Apply filters
@@ -223,6 +267,9 @@ async def search_cryptos(
             
             filtered_cryptos.append(crypto)
         
+        if _wants_ndjson(request):
+            return _ndjson_response(filtered_cryptos)
+        
         return {
             "success": True,
             "message": f"Found {len(filtered_cryptos)} cryptocurrencies matching criteria",
@@ -241,37 +288,64 @@ async def search_cryptos(
         logger.error(f"Error in crypto search: {e}")
         raise HTTPException(status_code=500, detail=f"Error searching cryptocurrencies: {str(e)}")
 
-@router.get("/popular", response_model=Dict[str, Any])
-async def get_popular_cryptos(manager: ConfigManager = Depends(get_config_manager)):
+# Popular/recommended crypto sets
+POPULAR_SETS = {
+    "top_market_cap": ("BTC", "ETH", "SOL", "AVAX"),
+    "defi_favorites": ("ETH", "UNI", "LINK", "MATIC"),
+    "layer1_blockchains": ("BTC", "ETH", "SOL", "ADA", "ATOM", "DOT"),
+    "recommended_starter": ("BTC", "ETH", "SOL")
+}
+
+def _filter_popular_sets(status: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Filter popular crypto sets down to the symbols present in a crypto status"""
+    available_symbols = {crypto['symbol'] for crypto in status['cryptos']}
+    
+    # Filter popular sets by availability
+    filtered_sets = {}
+    for set_name, symbols in POPULAR_SETS.items():
+        available_in_set = [symbol for symbol in symbols if symbol in available_symbols]
+        if available_in_set:
+            filtered_sets[set_name] = available_in_set
+    
+    return filtered_sets
+
+# Memoized /popular response: (status_version, response)
+_popular_cache: Optional[Tuple[int, Dict[str, Any]]] = None
+
+async def _get_popular_response(manager: ConfigManager) -> Dict[str, Any]:
+    """Build the /popular response, reusing it until the crypto status changes"""
+    global _popular_cache
+    
+    if _popular_cache is not None and _popular_cache[0] == manager.status_version:
+        return _popular_cache[1]
+    
+    # Get availability data (may load availability and bump the version)
+    status = await manager.get_crypto_status()
+    filtered_sets = _filter_popular_sets(status)
+    
+    response = {
+        "success": True,
+        "message": "Popular crypto sets retrieved",
+        "data": {
+            "popular_sets": filtered_sets,
+            "total_sets": len(filtered_sets)
+        }
+    }
+    _popular_cache = (manager.status_version, response)
+    return response
+
+@router.get("/popular", response_class=ORJSONResponse)
+async def get_popular_cryptos(request: Request, response: Response):
     """Get popular/recommended cryptocurrency selections"""
     try:
-        # Define popular crypto sets
-        popular_sets = {
-            "top_market_cap": ["BTC", "ETH", "SOL", "AVAX"],
-            "defi_favorites": ["ETH", "UNI", "LINK", "MATIC"],
-            "layer1_blockchains": ["BTC", "ETH", "SOL", "ADA", "ATOM", "DOT"],
-            "recommended_starter": ["BTC", "ETH", "SOL"]
-        }
-        
-        # Get availability data
-        status = await manager.get_crypto_status()
-        available_symbols = [crypto['symbol'] for crypto in status['cryptos']]
+        popular_response = await _get_popular_response(config_manager)
         
-        # Filter popular sets by availability
-        filtered_sets = {}
-        for set_name, symbols in popular_sets.items():
-            available_in_set = [symbol for symbol in symbols if symbol in available_symbols]
-            if available_in_set:
-                filtered_sets[set_name] = available_in_set
+        headers = _cache_headers(_popular_cache[0], popular_response["data"]["total_sets"])
+        if _is_not_modified(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
         
-        return {
-            "success": True,
-            "message": "Popular crypto sets retrieved",
-            "data": {
-                "popular_sets": filtered_sets,
-                "total_sets": len(filtered_sets)
-            }
-        }
+        return popular_response
         
     except Exception as e:
         logger.error(f"Error getting popular cryptos: {e}")
@@ -279,13 +353,12 @@ async def get_popular_cryptos(manager: ConfigManager = Depends(get_config_manage
 
 @router.post("/quick-actions/activate-popular", response_model=ApiResponse)
 async def activate_popular_cryptos(
-    set_name: str = "recommended_starter",
-    manager: ConfigManager = Depends(get_config_manager)
+    set_name: str = "recommended_starter"
 ):
     """Quick action to activate a popular set of cryptocurrencies"""
     try:
-        # Get popular sets
-        popular_response = await get_popular_cryptos(manager)
+        # Memoized popular sets - no status read unless the status changed
+        popular_response = await _get_popular_response(config_manager)
         popular_sets = popular_response["data"]["popular_sets"]
         
         if set_name not in popular_sets:
@@ -295,7 +368,7 @@ async def activate_popular_cryptos(
         
         # Create batch update request
         updates = {symbol: True for symbol in symbols}
-        result = await manager.batch_update_cryptos(updates)
+        result = await config_manager.batch_update_cryptos(updates)
         
         return ApiResponse(
             success=result['success'],
@@ -315,11 +388,11 @@ async def activate_popular_cryptos(
         raise HTTPException(status_code=500, detail=f"Error in quick activation: {str(e)}")
 
 @router.post("/quick-actions/clear-all", response_model=ApiResponse)
-async def clear_all_cryptos(manager: ConfigManager = Depends(get_config_manager)):
+async def clear_all_cryptos():
     """Quick action to deactivate all cryptocurrencies"""
     try:
         # Get currently active cryptos
-        active_cryptos = manager.get_active_cryptos_for_bot()
+        active_cryptos = config_manager.get_active_cryptos_for_bot()
         
         if not active_cryptos:
             return ApiResponse(
@@ -330,7 +403,7 @@ async def clear_all_cryptos(manager: ConfigManager = Depends(get_config_manager)
         
         # Create batch update request to deactivate all
         updates = {symbol: False for symbol in active_cryptos.keys()}
-        result = await manager.batch_update_cryptos(updates)
+        result = await config_manager.batch_update_cryptos(updates)
         
         return ApiResponse(
             success=result['success'],
@@ -348,11 +421,11 @@ async def clear_all_cryptos(manager: ConfigManager = Depends(get_config_manager)
 
 # Health check endpoint
 @router.get("/health", response_model=Dict[str, Any])
-async def health_check(manager: ConfigManager = Depends(get_config_manager)):
+async def health_check():
     """Health check for crypto configuration service"""
     try:
         # Test database connection
-        configs = manager.db.get_crypto_configs()
+        configs = config_manager.db.get_crypto_configs()
         
         return {
             "success": True,
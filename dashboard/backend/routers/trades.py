@@ -5,15 +5,11 @@ Endpoints for trade history, positions, and trade-related data
 
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Dict, Any, Optional, List
+import asyncio
 import logging
-from datetime import datetime
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
 
 from dashboard.backend.data_service import DataService
+from dashboard.backend.timestamps import iso_now
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -39,28 +35,15 @@ async def get_trades(
         # Calculate offset from page
         offset = (page - 1) * limit
         
-        # Get recent trades (basic implementation)
-        trades = await data_service.get_recent_trades(limit=500)  # Get more for filtering
-        
-        # Apply filters
-        if symbol:
-            trades = [t for t in trades if t["coin"].upper() == symbol.upper()]
-        
-        if side:
-            trades = [t for t in trades if t["side"].upper() == side.upper()]
-        
-        # Sort trades
-        reverse_sort = sort_order.lower() == "desc"
-        if sort_by == "timestamp":
-            trades.sort(key=lambda x: x.get("timestamp", ""), reverse=reverse_sort)
-        elif sort_by == "pnl":
-            trades.sort(key=lambda x: x.get("pnl", 0), reverse=reverse_sort)
-        elif sort_by == "size":
-            trades.sort(key=lambda x: x.get("size", 0), reverse=reverse_sort)
-        
-        # Apply pagination
-        total_count = len(trades)
-        paginated_trades = trades[offset:offset + limit]
+        # Filtering, sorting, pagination and counting are pushed down to SQL
+        paginated_trades, total_count = await data_service.query_trades(
+            symbol=symbol,
+            side=side,
+            sort_by=sort_by,
+            descending=sort_order.lower() == "desc",
+            limit=limit,
+            offset=offset
+        )
         
         return {
             "success": True,
@@ -92,7 +75,7 @@ async def get_trade_history(
     """Get trade history with filtering and pagination"""
     try:
         # Get recent trades (basic implementation)
-        trades = await data_service.get_recent_trades(limit=limit + offset)
+        trades = await data_service.get_recent_trade_rows(limit=limit + offset)
         
         # Apply offset
         if offset > 0:
@@ -103,20 +86,22 @@ async def get_trade_history(
         
         # Apply filters
         if coin:
-            trades = [t for t in trades if t["coin"].upper() == coin.upper()]
+            coin_upper = coin.upper()
+            trades = [t for t in trades if t.coin.upper() == coin_upper]
         
         if side:
-            trades = [t for t in trades if t["side"].upper() == side.upper()]
+            side_upper = side.upper()
+            trades = [t for t in trades if t.side.upper() == side_upper]
         
         # Calculate summary statistics for filtered results
         total_trades = len(trades)
-        total_pnl = sum(trade.get("pnl", 0) for trade in trades)
-        winning_trades = len([t for t in trades if t.get("pnl", 0) > 0])
+        total_pnl = sum(trade.pnl or 0 for trade in trades)
+        winning_trades = len([t for t in trades if (t.pnl or 0) > 0])
         
         return {
             "success": True,
             "data": {
-                "trades": trades,
+                "trades": [trade.to_dict() for trade in trades],
                 "pagination": {
                     "limit": limit,
                     "offset": offset,
@@ -153,7 +138,7 @@ async def get_recent_trades(
             "data": {
                 "trades": trades,
                 "count": len(trades),
-                "last_updated": datetime.now().isoformat()
+                "last_updated": iso_now()
             }
         }
         
@@ -185,7 +170,7 @@ async def get_current_positions(
                     "short_positions": short_positions,
                     "total_unrealized_pnl": round(total_unrealized_pnl, 2)
                 },
-                "last_updated": datetime.now().isoformat()
+                "last_updated": iso_now()
             }
         }
         
@@ -202,16 +187,16 @@ async def get_trade_details(
     try:
         # Get all recent trades and find the specific one
         # This is a simple implementation - could be optimized with direct DB query
-        trades = await data_service.get_recent_trades(limit=1000)
+        trades = await data_service.get_recent_trade_rows(limit=1000)
         
-        trade = next((t for t in trades if t["id"] == trade_id), None)
+        trade = next((t for t in trades if t.id == trade_id), None)
         
         if not trade:
             raise HTTPException(status_code=404, detail=f"Trade {trade_id} not found")
         
         return {
             "success": True,
-            "data": trade
+            "data": trade.to_dict()
         }
         
     except HTTPException:
@@ -235,20 +220,22 @@ async def get_trade_statistics(
                 detail=f"Invalid period. Must be one of: {', '.join(valid_periods)}"
             )
         
-        # Get data
-        trading_summary = await data_service.get_trading_summary()
-        analytics_summary = await data_service.get_analytics_summary()
-        recent_trades = await data_service.get_recent_trades(limit=100)
+        # Get data - independent queries run concurrently
+        trading_summary, analytics_summary, recent_trades = await asyncio.gather(
+            data_service.get_trading_summary(),
+            data_service.get_analytics_summary(),
+            data_service.get_recent_trade_rows(limit=100)
+        )
         
         # Calculate additional statistics
         if recent_trades:
-            trade_sizes = [t.get("size", 0) for t in recent_trades]
-            trade_prices = [t.get("price", 0) for t in recent_trades]
+            trade_sizes = [t.size or 0 for t in recent_trades]
+            trade_prices = [t.price or 0 for t in recent_trades]
             
             avg_trade_size = sum(trade_sizes) / len(trade_sizes) if trade_sizes else 0
             avg_trade_price = sum(trade_prices) / len(trade_prices) if trade_prices else 0
             
-            confidence_scores = [t.get("prediction_confidence", 0) for t in recent_trades if t.get("prediction_confidence")]
+            confidence_scores = [t.prediction_confidence for t in recent_trades if t.prediction_confidence]
             avg_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
         else:
             avg_trade_size = 0
@@ -262,10 +249,10 @@ async def get_trade_statistics(
                 "average_trade_size": round(avg_trade_size, 4),
                 "average_trade_price": round(avg_trade_price, 2),
                 "average_confidence": round(avg_confidence, 2),
-                "total_volume": sum(t.get("size", 0) * t.get("price", 0) for t in recent_trades)
+                "total_volume": sum((t.size or 0) * (t.price or 0) for t in recent_trades)
             },
             "coin_breakdown": analytics_summary.get("coin_performance", []),
-            "calculated_at": datetime.now().isoformat()
+            "calculated_at": iso_now()
         }
         
         return {
@@ -289,33 +276,26 @@ async def search_trades(
     """Search trades by various criteria"""
     try:
         # Get trades to search through
-        trades = await data_service.get_recent_trades(limit=500)
+        trades = await data_service.get_recent_trade_rows(limit=500)
         
         # Filter based on search criteria
         filtered_trades = []
         query_lower = query.lower()
+        search_coin = field in ("all", "coin")
+        search_side = field in ("all", "side")
+        search_reasoning = field in ("all", "ai_reasoning")
         
         for trade in trades:
-            match_found = False
-            
-            if field == "all" or field == "coin":
-                if query_lower in trade.get("coin", "").lower():
-                    match_found = True
-            
-            if field == "all" or field == "side":
-                if query_lower in trade.get("side", "").lower():
-                    match_found = True
-            
-            if field == "all" or field == "ai_reasoning":
-                ai_reasoning = trade.get("ai_reasoning", "") or ""
-                if query_lower in ai_reasoning.lower():
-                    match_found = True
-            
-            if match_found:
+            # Short-circuit on the first matching field
+            if search_coin and query_lower in (trade.coin or "").lower():
+                filtered_trades.append(trade)
+            elif search_side and query_lower in (trade.side or "").lower():
+                filtered_trades.append(trade)
+            elif search_reasoning and query_lower in (trade.ai_reasoning or "").lower():
                 filtered_trades.append(trade)
         
-        # Limit results
-        filtered_trades = filtered_trades[:limit]
+        # Limit results and convert to dicts only at the response boundary
+        filtered_trades = [trade.to_dict() for trade in filtered_trades[:limit]]
         
         return {
             "success": True,
@@ -353,7 +333,7 @@ async def trades_health_check(
                 "database_connection": "healthy" if db_healthy else "unhealthy",
                 "trades_service": "operational",
                 "sample_data_available": len(recent_trades) > 0,
-                "last_check": datetime.now().isoformat()
+                "last_check": iso_now()
             }
         }
         
@@ -6,20 +6,29 @@ Key component to resolve the "Start Monitoring" button issue
 
 import asyncio
 import logging
+from collections import deque
+from itertools import islice
 from datetime import datetime
-from typing import Dict, Any, Optional
-import json
-import sys
-import os
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))))
+import orjson
 
 logger = logging.getLogger(__name__)
 
+def _state_json_default(obj: Any) -> Any:
+    """orjson fallback for state values it can't encode natively"""
+    if isinstance(obj, deque):
+        return list(obj)
+    return str(obj)
+
 class StateSyncService:
     """Manages state synchronization between bot and dashboard"""
     
+    # Activities kept in memory for the journal / full state sync
+    ACTIVITY_STREAM_LIMIT = 100
+    FULL_SYNC_ACTIVITY_COUNT = 20
+    
     def __init__(self, websocket_manager=None):
         self.websocket_manager = websocket_manager
         
@@ -35,9 +44,11 @@ class StateSyncService:
                 "monitoring_enabled": False,
                 "active_cryptos": {}
             },
-            "activity_stream": [],
+            "activity_stream": deque(maxlen=self.ACTIVITY_STREAM_LIMIT),
             "last_sync": None
         }
+        self._state_view = MappingProxyType(self.current_state)
+        self._cached_state_json: Optional[bytes] = None
         
         # State change listeners
         self.state_listeners = []
@@ -51,46 +62,56 @@ class StateSyncService:
         """Add a state change listener"""
         self.state_listeners.append(listener)
     
+    @staticmethod
+    async def _notify_mode_change(listener, mode_data: Dict[str, Any]):
+        """Call one listener; wrapped so even a missing hook surfaces via gather"""
+        await listener.on_mode_change(mode_data)
+    
     async def sync_mode_change(self, mode_data: Dict[str, Any]):
         """Sync bot mode changes (STANDBY/ACTIVE) to dashboard"""
         try:
+            timestamp = datetime.now().isoformat()
+            mode = mode_data.get("mode", "STANDBY")
+            monitoring_enabled = mode_data.get("monitoring_enabled", False)
+            active_cryptos = mode_data.get("active_cryptos", {})
+            
             # Update local state
+            self._cached_state_json = None
             self.current_state["bot_mode"].update({
-                "mode": mode_data.get("mode", "STANDBY"),
-                "monitoring_enabled": mode_data.get("monitoring_enabled", False),
-                "active_cryptos": mode_data.get("active_cryptos", {}),
-                "last_updated": datetime.now().isoformat()
+                "mode": mode,
+                "monitoring_enabled": monitoring_enabled,
+                "active_cryptos": active_cryptos,
+                "last_updated": timestamp
             })
             
-            # Prepare WebSocket message
-            sync_message = {
-                "type": "bot_mode_update",
-                "data": {
-                    "mode": mode_data.get("mode", "STANDBY"),
-                    "monitoring_enabled": mode_data.get("monitoring_enabled", False),
-                    "active_cryptos": mode_data.get("active_cryptos", {}),
-                    "crypto_count": len(mode_data.get("active_cryptos", {})),
-                    "timestamp": datetime.now().isoformat()
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-            
             # Broadcast via WebSocket
-            if self.websocket_manager:
-                await self.websocket_manager.broadcast_to_all(sync_message)
-                logger.info(f"Broadcasted mode change: {mode_data.get('mode', 'UNKNOWN')}")
-            else:
+            if not self.websocket_manager:
                 logger.warning("WebSocket manager not available - mode change not broadcasted")
+            elif self.websocket_manager.active_connections:
+                # Queued like every sync broadcast, so they keep their order and
+                # repeated state snapshots coalesce (WebSocketManager.COALESCED_TYPES)
+                await self.websocket_manager.queue_broadcast("bot_mode_update", {
+                    "mode": mode,
+                    "monitoring_enabled": monitoring_enabled,
+                    "active_cryptos": active_cryptos,
+                    "crypto_count": len(active_cryptos),
+                    "timestamp": timestamp
+                })
+                logger.info(f"Broadcasted mode change: {mode_data.get('mode', 'UNKNOWN')}")
             
-            # Notify state listeners
-            for listener in self.state_listeners:
-                try:
-                    await listener.on_mode_change(mode_data)
-                except Exception as e:
-                    logger.error(f"Error notifying state listener: {e}")
+            # Notify state listeners concurrently so a slow one doesn't hold up the rest
+            if self.state_listeners:
+                results = await asyncio.gather(
+                    *(self._notify_mode_change(listener, mode_data) for listener in self.state_listeners),
+                    return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Error notifying state listener: {result}")
             
             # Update sync timestamp
-            self.current_state["last_sync"] = datetime.now().isoformat()
+            self.current_state["last_sync"] = timestamp
+            self._cached_state_json = None
             
             return True
             
@@ -101,38 +122,39 @@ class StateSyncService:
     async def sync_process_status_change(self, process_data: Dict[str, Any]):
         """Sync bot process status changes to dashboard"""
         try:
+            timestamp = datetime.now().isoformat()
+            status = process_data.get("status", "stopped")
+            pid = process_data.get("pid")
+            uptime = process_data.get("uptime", 0)
+            external_process = process_data.get("external_process", False)
+            
             # Update local state
+            self._cached_state_json = None
             self.current_state["bot_process"].update({
-                "status": process_data.get("status", "stopped"),
-                "pid": process_data.get("pid"),
-                "uptime": process_data.get("uptime", 0),
-                "external_process": process_data.get("external_process", False),
-                "last_updated": datetime.now().isoformat()
+                "status": status,
+                "pid": pid,
+                "uptime": uptime,
+                "external_process": external_process,
+                "last_updated": timestamp
             })
             
-            # Prepare WebSocket message
-            sync_message = {
-                "type": "bot_process_update",
-                "data": {
-                    "status": process_data.get("status", "stopped"),
-                    "pid": process_data.get("pid"),
-                    "uptime": process_data.get("uptime", 0),
-                    "external_process": process_data.get("external_process", False),
-                    "restart_count": process_data.get("restart_count", 0),
-                    "timestamp": datetime.now().isoformat()
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-            
             # Broadcast via WebSocket
-            if self.websocket_manager:
-                await self.websocket_manager.broadcast_to_all(sync_message)
-                logger.info(f"Broadcasted process status change: {process_data.get('status', 'UNKNOWN')}")
-            else:
+            if not self.websocket_manager:
                 logger.warning("WebSocket manager not available - process status not broadcasted")
+            elif self.websocket_manager.active_connections:
+                await self.websocket_manager.queue_broadcast("bot_process_update", {
+                    "status": status,
+                    "pid": pid,
+                    "uptime": uptime,
+                    "external_process": external_process,
+                    "restart_count": process_data.get("restart_count", 0),
+                    "timestamp": timestamp
+                })
+                logger.info(f"Broadcasted process status change: {process_data.get('status', 'UNKNOWN')}")
             
             # Update sync timestamp
-            self.current_state["last_sync"] = datetime.now().isoformat()
+            self.current_state["last_sync"] = timestamp
+            self._cached_state_json = None
             
             return True
             
@@ -143,27 +165,24 @@ class StateSyncService:
     async def sync_crypto_config_change(self, crypto_data: Dict[str, Any]):
         """Sync crypto configuration changes to dashboard"""
         try:
-            # Update local state
-            self.current_state["bot_mode"]["active_cryptos"] = crypto_data.get("active_cryptos", {})
+            timestamp = datetime.now().isoformat()
+            active_cryptos = crypto_data.get("active_cryptos", {})
             
-            # Prepare WebSocket message
-            sync_message = {
-                "type": "crypto_config_update",
-                "data": {
-                    "active_cryptos": crypto_data.get("active_cryptos", {}),
-                    "crypto_count": len(crypto_data.get("active_cryptos", {})),
-                    "updates": crypto_data.get("updates", {}),
-                    "timestamp": datetime.now().isoformat()
-                },
-                "timestamp": datetime.now().isoformat()
-            }
+            # Update local state
+            self._cached_state_json = None
+            self.current_state["bot_mode"]["active_cryptos"] = active_cryptos
             
             # Broadcast via WebSocket
-            if self.websocket_manager:
-                await self.websocket_manager.broadcast_to_all(sync_message)
-                logger.info(f"Broadcasted crypto config change: {len(crypto_data.get('active_cryptos', {}))} active cryptos")
-            else:
+            if not self.websocket_manager:
                 logger.warning("WebSocket manager not available - crypto config not broadcasted")
+            elif self.websocket_manager.active_connections:
+                await self.websocket_manager.queue_broadcast("crypto_config_update", {
+                    "active_cryptos": active_cryptos,
+                    "crypto_count": len(active_cryptos),
+                    "updates": crypto_data.get("updates", {}),
+                    "timestamp": timestamp
+                })
+                logger.info(f"Broadcasted crypto config change: {len(active_cryptos)} active cryptos")
             
             return True
             
@@ -174,24 +193,21 @@ class StateSyncService:
     async def sync_crypto_activation(self, activation_data: Dict[str, Any]):
         """Sync individual crypto activation/deactivation"""
         try:
-            # Prepare WebSocket message
-            sync_message = {
-                "type": "crypto_activation_update",
-                "data": {
-                    "symbol": activation_data.get("symbol"),
-                    "action": activation_data.get("action"),  # ACTIVATED or DEACTIVATED
-                    "active_cryptos": activation_data.get("active_cryptos", {}),
-                    "timestamp": datetime.now().isoformat()
-                },
-                "timestamp": datetime.now().isoformat()
-            }
+            timestamp = datetime.now().isoformat()
+            symbol = activation_data.get("symbol")
+            action = activation_data.get("action")  # ACTIVATED or DEACTIVATED
             
             # Broadcast via WebSocket
-            if self.websocket_manager:
-                await self.websocket_manager.broadcast_to_all(sync_message)
-                logger.info(f"Broadcasted crypto activation: {activation_data.get('symbol')} {activation_data.get('action')}")
-            else:
+            if not self.websocket_manager:
                 logger.warning("WebSocket manager not available - crypto activation not broadcasted")
+            elif self.websocket_manager.active_connections:
+                await self.websocket_manager.queue_broadcast("crypto_activation_update", {
+                    "symbol": symbol,
+                    "action": action,
+                    "active_cryptos": activation_data.get("active_cryptos", {}),
+                    "timestamp": timestamp
+                })
+                logger.info(f"Broadcasted crypto activation: {symbol} {action}")
             
             return True
             
@@ -202,47 +218,32 @@ class StateSyncService:
     async def sync_activity_update(self, activity_data: Dict[str, Any]):
         """Sync new activity for the activity journal"""
         try:
-            # Add to activity stream (maintain last 100 entries)
-            self.current_state["activity_stream"].append({
+            timestamp = datetime.now().isoformat()
+            
+            activity = {
                 "id": activity_data.get("id"),
-                "timestamp": activity_data.get("timestamp", datetime.now().isoformat()),
+                "timestamp": activity_data.get("timestamp", timestamp),
                 "activity_type": activity_data.get("activity_type"),
                 "token": activity_data.get("token"),
                 "title": activity_data.get("title"),
                 "description": activity_data.get("description"),
                 "severity": activity_data.get("severity", "INFO"),
                 "data": activity_data.get("data", {})
-            })
-            
-            # Keep only last 100 activities
-            if len(self.current_state["activity_stream"]) > 100:
-                self.current_state["activity_stream"] = self.current_state["activity_stream"][-100:]
-            
-            # Prepare WebSocket message
-            sync_message = {
-                "type": "activity_update",
-                "data": {
-                    "activity": {
-                        "id": activity_data.get("id"),
-                        "timestamp": activity_data.get("timestamp", datetime.now().isoformat()),
-                        "activity_type": activity_data.get("activity_type"),
-                        "token": activity_data.get("token"),
-                        "title": activity_data.get("title"),
-                        "description": activity_data.get("description"),
-                        "severity": activity_data.get("severity", "INFO"),
-                        "data": activity_data.get("data", {})
-                    },
-                    "stream_length": len(self.current_state["activity_stream"])
-                },
-                "timestamp": datetime.now().isoformat()
             }
             
+            # Add to activity stream (the deque keeps only the last 100 entries)
+            self._cached_state_json = None
+            self.current_state["activity_stream"].append(activity)
+            
             # Broadcast via WebSocket
-            if self.websocket_manager:
-                await self.websocket_manager.broadcast_to_all(sync_message)
-                logger.debug(f"Broadcasted activity update: {activity_data.get('title', 'Unknown')}")
-            else:
+            if not self.websocket_manager:
                 logger.warning("WebSocket manager not available - activity not broadcasted")
+            elif self.websocket_manager.active_connections:
+                await self.websocket_manager.queue_broadcast("activity_update", {
+                    "activity": activity,
+                    "stream_length": len(self.current_state["activity_stream"])
+                })
+                logger.debug(f"Broadcasted activity update: {activity_data.get('title', 'Unknown')}")
             
             return True
             
@@ -250,24 +251,37 @@ class StateSyncService:
             logger.error(f"Error syncing activity update: {e}")
             return False
     
-    async def send_full_state_sync(self, client_id: Optional[str] = None):
+    async def send_full_state_sync(self, client_id: Optional[int] = None):
         """Send complete state synchronization to client(s)"""
         try:
+            if (client_id is None and self.websocket_manager
+                    and not self.websocket_manager.active_connections):
+                # Nobody to broadcast to
+                return True
+            
+            timestamp = datetime.now().isoformat()
+            activity_stream = self.current_state["activity_stream"]
+            recent_activities = list(islice(
+                activity_stream,
+                max(0, len(activity_stream) - self.FULL_SYNC_ACTIVITY_COUNT),
+                None
+            ))
+            
             # Prepare full state message
             full_state = {
                 "type": "full_state_sync",
                 "data": {
                     "bot_process": self.current_state["bot_process"],
                     "bot_mode": self.current_state["bot_mode"],
-                    "activity_stream": self.current_state["activity_stream"][-20:],  # Last 20 activities
-                    "sync_timestamp": datetime.now().isoformat()
+                    "activity_stream": recent_activities,  # Last 20 activities
+                    "sync_timestamp": timestamp
                 },
-                "timestamp": datetime.now().isoformat()
+                "timestamp": timestamp
             }
             
             # Send to specific client or broadcast to all
             if self.websocket_manager:
-                if client_id:
+                if client_id is not None:
                     await self.websocket_manager.send_to_client(client_id, full_state)
                     logger.info(f"Sent full state sync to client: {client_id}")
                 else:
@@ -282,9 +296,15 @@ class StateSyncService:
             logger.error(f"Error sending full state sync: {e}")
             return False
     
-    def get_current_state(self) -> Dict[str, Any]:
-        """Get current synchronized state"""
-        return self.current_state.copy()
+    def get_current_state(self) -> Mapping[str, Any]:
+        """Get a read-only view of the current synchronized state (no copy)"""
+        return self._state_view
+    
+    def get_current_state_json(self) -> bytes:
+        """Get the current state as JSON, re-encoded only after it changes"""
+        if self._cached_state_json is None:
+            self._cached_state_json = orjson.dumps(self.current_state, default=_state_json_default)
+        return self._cached_state_json
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check on state sync service"""
@@ -338,15 +358,17 @@ class StateSyncService:
                     "monitoring_enabled": False,
                     "active_cryptos": {}
                 },
-                "activity_stream": [],
+                "activity_stream": deque(maxlen=self.ACTIVITY_STREAM_LIMIT),
                 "last_sync": None
             }
+            self._state_view = MappingProxyType(self.current_state)
+            self._cached_state_json = None
             
             # Broadcast reset
             if self.websocket_manager:
                 reset_message = {
                     "type": "state_reset",
-                    "data": self.current_state,
+                    "data": dict(self.current_state, activity_stream=[]),
                     "timestamp": datetime.now().isoformat()
                 }
                 await self.websocket_manager.broadcast_to_all(reset_message)
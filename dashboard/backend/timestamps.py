@@ -0,0 +1,38 @@
+"""
+Timestamp Helpers
+Cheap ISO timestamps for response metadata (second resolution) and
+broadcast bursts (millisecond resolution)
+"""
+
+import time
+from datetime import datetime
+
+# Last computed ISO string and the monotonic second it belongs to
+_cached_second = None
+_cached_iso = ""
+
+# Same, per monotonic millisecond
+_cached_ms = None
+_cached_iso_ms = ""
+
+def iso_now() -> str:
+    """Get the current local time as an ISO string, recomputed at most once per second"""
+    global _cached_second, _cached_iso
+    
+    second = int(time.monotonic())
+    if second != _cached_second:
+        _cached_iso = datetime.now().isoformat()
+        _cached_second = second
+    
+    return _cached_iso
+
+def iso_now_ms() -> str:
+    """Get the current local time as an ISO string, recomputed at most once per millisecond"""
+    global _cached_ms, _cached_iso_ms
+    
+    ms = time.monotonic_ns() // 1_000_000
+    if ms != _cached_ms:
+        _cached_iso_ms = datetime.now().isoformat()
+        _cached_ms = ms
+    
+    return _cached_iso_ms
@@ -6,28 +6,119 @@ Enhanced for Phase 2 - State Sync Integration
 
 from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
-import json
+import itertools
 import logging
-import uuid
+import time
+import zlib
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-import sys
-import os
+from typing import Dict, List, Any, Optional, Tuple
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+import orjson
+
+from dashboard.backend.timestamps import iso_now_ms
 
 logger = logging.getLogger(__name__)
 
+# Payloads at least this large are zlib-compressed once before fan-out
+COMPRESSION_THRESHOLD = 2048
+# First byte of a compressed frame; plain JSON frames always start with "{"
+ZLIB_FRAME_TAG = b"\x01"
+
+def _encode(message: Any) -> bytes:
+    """Serialize an outgoing message to UTF-8 JSON, sent as a binary frame
+    
+    datetimes (and numpy values from market data) are encoded natively, so
+    producers can pass datetime.now() instead of formatting it themselves.
+    """
+    return orjson.dumps(
+        message,
+        default=str,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    )
+
+def _compress(payload: bytes) -> bytes:
+    """Compress a large encoded payload into a tagged frame, leave small ones as-is"""
+    if len(payload) < COMPRESSION_THRESHOLD:
+        return payload
+    return ZLIB_FRAME_TAG + zlib.compress(payload, 6)
+
+@dataclass(slots=True)
+class BroadcastMessage:
+    """Envelope for queued/direct broadcasts, encoded by orjson without an intermediate dict"""
+    type: str
+    data: Any
+    timestamp: str
+    priority: str = "normal"
+
 class WebSocketManager:
     """Enhanced WebSocket manager with state synchronization support"""
     
+    # Max broadcast frames buffered per client before it is dropped as too slow
+    CLIENT_QUEUE_SIZE = 256
+    
+    # Past this many waiting frames, broadcasters yield to the client writers
+    # so a burst from one task can't fill the queues of clients that keep up
+    CLIENT_QUEUE_HIGH_WATER = CLIENT_QUEUE_SIZE // 2
+    
+    # Droppable frames (heartbeats, market data) are only handed to clients
+    # with fewer than this many frames still waiting to be sent
+    CLIENT_QUEUE_LOW_WATER = 32
+    
+    # Max queued messages coalesced into a single "batch" frame
+    MAX_BATCH_SIZE = 64
+    
+    # Max entries waiting for the broadcast loop; producers never block on it
+    BROADCAST_QUEUE_SIZE = 1024
+    
+    # How broadcast() sends each kind that isn't a plain normal-priority queue entry
+    BROADCAST_ROUTES = {
+        "new_trade": "high",
+        "error": "high",
+        "market_data": "coalesce",
+    }
+    
+    # Market data ticks are held this long (seconds) and only the latest per
+    # symbol is sent
+    MARKET_DATA_FLUSH_INTERVAL = 0.1
+    
+    # Seconds between heartbeats, and the minimum gap enforced for any caller
+    HEARTBEAT_INTERVAL = 30
+    HEARTBEAT_MIN_GAP = 15
+    
+    # State snapshots where only the latest queued value matters; repeated
+    # updates of these types collapse into one broadcast
+    COALESCED_TYPES = frozenset({
+        "bot_status",
+        "bot_mode_update",
+        "bot_process_update",
+        "crypto_config_update",
+    })
+    
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
-        self.client_metadata: Dict[str, Dict[str, Any]] = {}  # Track client info
-        self.broadcast_queue: asyncio.Queue = asyncio.Queue()
+        # Mutated by connect/disconnect from any task: iterate over a snapshot
+        # (list(...)) whenever the loop body can await or disconnect
+        self.active_connections: Dict[int, WebSocket] = {}
+        # Client ids are small increasing ints: cheap to create and hash
+        self._client_ids = itertools.count(1)
+        self.client_metadata: Dict[int, Dict[str, Any]] = {}  # Track client info
+        self.broadcast_queue: asyncio.Queue = asyncio.Queue(maxsize=self.BROADCAST_QUEUE_SIZE)
         self._running = False
         
+        # Per-client outbound queues drained by one writer task per client
+        self.send_queues: Dict[int, asyncio.Queue] = {}
+        self.writer_tasks: Dict[int, asyncio.Task] = {}
+        
+        # Latest pending (priority, payload) per coalesced type; the broadcast
+        # queue only holds the type name as a placeholder for these
+        self._latest_by_type: Dict[str, Tuple[str, bytes]] = {}
+        self._dropped_broadcasts = 0
+        
+        # Latest pending market data message per symbol, flushed by a timer
+        self._market_data_buffer: Dict[str, BroadcastMessage] = {}
+        self._market_data_flush: Optional[asyncio.TimerHandle] = None
+        self._last_drop_warning = 0.0
+        
         # State sync integration
         self.state_sync_service = None
         
@@ -38,24 +129,45 @@ class WebSocketManager:
             "errors": 0,
             "last_activity": None
         }
+        
+        # Heartbeat envelope reused for every tick; only its values change
+        self._heartbeat_data: Dict[str, Any] = {
+            "connections": 0,
+            "total_messages_sent": 0,
+            "total_errors": 0,
+            "last_activity": None
+        }
+        self._heartbeat_message: Dict[str, Any] = {
+            "type": "heartbeat",
+            "timestamp": None,
+            "data": self._heartbeat_data
+        }
+        self._last_heartbeat = float("-inf")  # time.monotonic() of the last one sent
     
     def set_state_sync_service(self, state_sync_service):
         """Set the state sync service for integration"""
         self.state_sync_service = state_sync_service
         logger.info("State sync service integrated with WebSocket manager")
     
-    async def connect(self, websocket: WebSocket, client_info: Dict[str, Any] = None) -> str:
+    async def connect(self, websocket: WebSocket, client_info: Dict[str, Any] = None) -> int:
         """Accept a new WebSocket connection with optional client metadata"""
         await websocket.accept()
-        client_id = str(uuid.uuid4())
+        client_id = next(self._client_ids)
         self.active_connections[client_id] = websocket
         
-        # Store client metadata
+        # Start the client's writer before anything can be broadcast to it
+        send_queue = asyncio.Queue(maxsize=self.CLIENT_QUEUE_SIZE)
+        self.send_queues[client_id] = send_queue
+        self.writer_tasks[client_id] = asyncio.create_task(
+            self._client_writer(client_id, websocket, send_queue)
+        )
+        
+        # Store client metadata (last_activity is an epoch float, cheap to refresh)
         self.client_metadata[client_id] = {
             "connected_at": datetime.now().isoformat(),
             "user_agent": client_info.get("user_agent") if client_info else None,
             "ip_address": client_info.get("ip_address") if client_info else None,
-            "last_activity": datetime.now().isoformat()
+            "last_activity": time.time()
         }
         
         logger.info(f"WebSocket client connected: {client_id} (Total: {len(self.active_connections)})")
@@ -66,86 +178,176 @@ class WebSocketManager:
         
         return client_id
     
-    def disconnect(self, client_id: str):
-        """Remove a WebSocket connection"""
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
-            
-        if client_id in self.client_metadata:
-            del self.client_metadata[client_id]
-            
-        logger.info(f"WebSocket client disconnected: {client_id} (Remaining: {len(self.active_connections)})")
+    def disconnect(self, client_id: int):
+        """Remove a WebSocket connection (safe to call more than once)"""
+        websocket = self.active_connections.pop(client_id, None)
+        self.client_metadata.pop(client_id, None)
+        
+        self.send_queues.pop(client_id, None)
+        writer_task = self.writer_tasks.pop(client_id, None)
+        if writer_task and writer_task is not asyncio.current_task():
+            writer_task.cancel()
+        
+        if websocket is not None:
+            logger.info(f"WebSocket client disconnected: {client_id} (Remaining: {len(self.active_connections)})")
     
     async def disconnect_all(self):
         """Disconnect all active WebSocket connections"""
-        for client_id in list(self.active_connections.keys()):
-            try:
-                websocket = self.active_connections[client_id]
-                await websocket.close()
-            except Exception as e:
-                logger.error(f"Error closing WebSocket {client_id}: {e}")
-            finally:
-                self.disconnect(client_id)
+        connections = list(self.active_connections.items())
+        if not connections:
+            return
+        
+        # Forget every client up front so nothing new is queued to them
+        self.active_connections.clear()
+        self.client_metadata.clear()
+        self.send_queues.clear()
+        for writer_task in self.writer_tasks.values():
+            writer_task.cancel()
+        self.writer_tasks.clear()
+        
+        # Close all sockets concurrently
+        results = await asyncio.gather(
+            *(websocket.close() for _, websocket in connections),
+            return_exceptions=True
+        )
+        for (client_id, _), result in zip(connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error closing WebSocket {client_id}: {result}")
+        
+        logger.info(f"Disconnected all WebSocket clients ({len(connections)})")
     
-    async def send_to_client(self, client_id: str, message: dict):
-        """Send a message to a specific client (enhanced method name)"""
-        if client_id in self.active_connections:
-            try:
-                websocket = self.active_connections[client_id]
-                await websocket.send_json(message)
-                
-                # Update stats and client activity
-                self.message_stats["total_sent"] += 1
-                self.message_stats["last_activity"] = datetime.now().isoformat()
-                
-                if client_id in self.client_metadata:
-                    self.client_metadata[client_id]["last_activity"] = datetime.now().isoformat()
-                    
-            except WebSocketDisconnect:
-                self.disconnect(client_id)
-            except Exception as e:
-                logger.error(f"Error sending message to {client_id}: {e}")
-                self.message_stats["errors"] += 1
-                self.disconnect(client_id)
+    async def send_to_client(self, client_id: int, message: dict) -> bool:
+        """Send a message to a specific client (enhanced method name)
+        
+        The frame goes through the client's writer queue like broadcasts do, so
+        each socket has a single writer and targeted messages stay in order
+        with everything broadcast before them.
+        
+        Returns False if the client is gone or was just dropped as too slow.
+        """
+        send_queue = self.send_queues.get(client_id)
+        if send_queue is None:
+            return False
+        
+        try:
+            send_queue.put_nowait(_compress(_encode(message)))
+        except asyncio.QueueFull:
+            logger.warning(f"Dropping slow WebSocket client {client_id}: send queue full")
+            self.message_stats["errors"] += 1
+            self._drop_client(client_id)
+            return False
+        
+        self.message_stats["last_activity"] = time.time()
+        return True
     
-    async def send_personal_message(self, message: dict, client_id: str):
+    async def send_personal_message(self, message: dict, client_id: int):
         """Send a message to a specific client (legacy method for compatibility)"""
         await self.send_to_client(client_id, message)
     
-    async def broadcast_to_all(self, message: dict):
+    async def broadcast_to_all(self, message: Any):
         """Broadcast a message to all connected clients (enhanced method name)"""
         if not self.active_connections:
             return
         
-        disconnected_clients = []
-        successful_sends = 0
+        # Serialize once for all clients instead of send_json per client
+        if self._broadcast_payload(_encode(message)):
+            await asyncio.sleep(0)
+    
+    def _broadcast_payload(self, payload: bytes) -> bool:
+        """Broadcast an already-serialized message to all connected clients
+        
+        Returns True when some client's queue is past CLIENT_QUEUE_HIGH_WATER;
+        async callers then yield (asyncio.sleep(0)) so the writers can drain
+        before the next frame.
+        """
+        if not self.active_connections:
+            return False
+        
+        # Compress once for everyone rather than once per connection
+        payload = _compress(payload)
+        self.message_stats["last_activity"] = time.time()
         
-        for client_id, websocket in self.active_connections.items():
+        # Hand the payload to each client's writer; a client whose queue is
+        # full can't keep up and is dropped instead of stalling everyone else.
+        # Iterating the live dict is safe: nothing in the loop awaits, and the
+        # drops (which mutate it) happen after the loop.
+        slow_clients = set()
+        backlog = 0
+        for client_id, send_queue in self.send_queues.items():
             try:
-                await websocket.send_json(message)
-                successful_sends += 1
-                
-                # Update client activity
-                if client_id in self.client_metadata:
-                    self.client_metadata[client_id]["last_activity"] = datetime.now().isoformat()
-                    
-            except WebSocketDisconnect:
-                disconnected_clients.append(client_id)
-            except Exception as e:
-                logger.error(f"Error broadcasting to {client_id}: {e}")
-                disconnected_clients.append(client_id)
-                self.message_stats["errors"] += 1
+                send_queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                slow_clients.add(client_id)
+                continue
+            backlog = max(backlog, send_queue.qsize())
         
-        # Update stats
-        self.message_stats["total_sent"] += successful_sends
-        self.message_stats["last_activity"] = datetime.now().isoformat()
+        for client_id in slow_clients:
+            logger.warning(f"Dropping slow WebSocket client {client_id}: send queue full")
+            self.message_stats["errors"] += 1
+            self._drop_client(client_id)
         
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            self.disconnect(client_id)
+        return backlog >= self.CLIENT_QUEUE_HIGH_WATER
+    
+    def broadcast_sync(self, payload: bytes):
+        """Fire-and-forget broadcast for frames that may be lost
         
-        if successful_sends > 0:
-            logger.debug(f"Broadcasted message to {successful_sends} clients")
+        Clients whose send queue is past CLIENT_QUEUE_LOW_WATER just miss this
+        frame instead of growing their backlog towards being dropped; the next
+        heartbeat or tick supersedes it anyway.
+        """
+        if not self.active_connections:
+            return
+        
+        payload = _compress(payload)
+        self.message_stats["last_activity"] = time.time()
+        
+        for send_queue in self.send_queues.values():
+            if send_queue.qsize() < self.CLIENT_QUEUE_LOW_WATER:
+                send_queue.put_nowait(payload)
+    
+    async def _client_writer(self, client_id: int, websocket: WebSocket, send_queue: asyncio.Queue):
+        """Send queued payloads to one client until it disconnects"""
+        while True:
+            payload = await send_queue.get()
+            _, error = await self._safe_send(client_id, websocket, payload)
+            
+            if error is not None:
+                if error != "disconnect":
+                    logger.error(f"Error broadcasting to {client_id}: {error}")
+                    self.message_stats["errors"] += 1
+                self.disconnect(client_id)
+                return
+            
+            # Update stats and client activity; the broadcast already stamped
+            # message_stats["last_activity"] once for the whole wave
+            self.message_stats["total_sent"] += 1
+            metadata = self.client_metadata.get(client_id)
+            if metadata is not None:
+                metadata["last_activity"] = time.time()
+    
+    def _drop_client(self, client_id: int):
+        """Disconnect a client and close its socket in the background"""
+        websocket = self.active_connections.get(client_id)
+        self.disconnect(client_id)
+        if websocket is not None:
+            asyncio.create_task(self._close_quietly(client_id, websocket))
+    
+    async def _close_quietly(self, client_id: int, websocket: WebSocket):
+        """Close a socket, ignoring errors from already-dead connections"""
+        try:
+            await websocket.close(code=1013)  # Try again later
+        except Exception as e:
+            logger.debug(f"Error closing dropped WebSocket {client_id}: {e}")
+    
+    async def _safe_send(self, client_id: int, websocket: WebSocket, payload: bytes):
+        """Send a pre-serialized payload, returning (client_id, error) instead of raising"""
+        try:
+            await websocket.send_bytes(payload)
+            return client_id, None
+        except WebSocketDisconnect:
+            return client_id, "disconnect"
+        except Exception as e:
+            return client_id, e
     
     async def broadcast_message(self, message: dict):
         """Broadcast a message to all connected clients (legacy method for compatibility)"""
@@ -155,10 +357,13 @@ class WebSocketManager:
     
     async def broadcast_state_sync(self, sync_type: str, data: Any):
         """Broadcast state synchronization messages"""
+        if not self.active_connections:
+            return
+        
         message = {
             "type": f"state_sync_{sync_type}",
             "data": data,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now_ms(),
             "source": "state_sync_service"
         }
         await self.broadcast_to_all(message)
@@ -178,10 +383,13 @@ class WebSocketManager:
     
     async def broadcast_activity_stream(self, activity_data: Dict[str, Any]):
         """Broadcast new activity for the journal"""
+        if not self.active_connections:
+            return
+        
         message = {
             "type": "activity_update",
             "data": activity_data,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": iso_now_ms(),
             "source": "activity_logger"
         }
         await self.broadcast_to_all(message)
@@ -190,90 +398,210 @@ class WebSocketManager:
     
     async def queue_broadcast(self, message_type: str, data: Any, priority: str = "normal"):
         """Queue a message for broadcasting with priority support"""
-        message = {
-            "type": message_type,
-            "data": data,
-            "timestamp": datetime.now().isoformat(),
-            "priority": priority
-        }
-        await self.broadcast_queue.put(message)
+        if not self.active_connections:
+            return
+        
+        message = BroadcastMessage(message_type, data, iso_now_ms(), priority)
+        # Encode here so the broadcast loop only moves ready-made payloads
+        entry = (priority, _encode(message))
+        
+        if message_type in self.COALESCED_TYPES:
+            already_queued = message_type in self._latest_by_type
+            self._latest_by_type[message_type] = entry
+            if already_queued:
+                return
+            if not self._enqueue(message_type, priority):
+                del self._latest_by_type[message_type]
+            return
+        
+        self._enqueue(entry, priority)
+    
+    def _enqueue(self, item: Any, priority: str) -> bool:
+        """Put an item on the broadcast queue without blocking the producer
+        
+        When the queue is full, normal-priority items are dropped; high-priority
+        ones (trades, errors) evict the oldest queued item to make room.
+        """
+        try:
+            self.broadcast_queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            pass
+        
+        if priority == "high":
+            evicted = self.broadcast_queue.get_nowait()
+            if isinstance(evicted, str):
+                self._latest_by_type.pop(evicted, None)
+            self.broadcast_queue.put_nowait(item)
+            self._note_dropped_broadcast()
+            return True
+        
+        self._note_dropped_broadcast()
+        return False
+    
+    def _note_dropped_broadcast(self):
+        """Count a dropped broadcast, warning at most once per second"""
+        self._dropped_broadcasts += 1
+        now = time.monotonic()
+        if now - self._last_drop_warning >= 1.0:
+            logger.warning(
+                f"Broadcast queue full: {self._dropped_broadcasts} message(s) dropped so far"
+            )
+            self._last_drop_warning = now
     
     async def broadcast_loop(self):
         """Enhanced background task to process broadcast queue"""
         self._running = True
         logger.info("🔄 Enhanced WebSocket broadcast loop started")
         
-        heartbeat_interval = 30  # seconds
-        last_heartbeat = datetime.now()
-        
+        # Heartbeats run on their own timer so the queue wait never times out
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        try:
+            while self._running:
+                try:
+                    # Sleep until something is queued (None is a stop wake-up)
+                    message = await self.broadcast_queue.get()
+                    if message is not None:
+                        await self._drain_and_broadcast(message)
+                        
+                except Exception as e:
+                    logger.error(f"Error in enhanced broadcast loop: {e}")
+                    await asyncio.sleep(1)
+        finally:
+            heartbeat_task.cancel()
+    
+    async def _heartbeat_loop(self):
+        """Send a heartbeat every HEARTBEAT_INTERVAL seconds while the loop runs"""
         while self._running:
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
             try:
-                # Process queued messages
-                try:
-                    message = await asyncio.wait_for(
-                        self.broadcast_queue.get(), 
-                        timeout=1.0
-                    )
-                    await self.broadcast_to_all(message)
-                except asyncio.TimeoutError:
-                    # Timeout is expected, continue loop
-                    pass
-                
-                # Send periodic heartbeat if we have connections
-                now = datetime.now()
-                if (self.active_connections and 
-                    (now - last_heartbeat).seconds >= heartbeat_interval):
-                    await self.broadcast_heartbeat()
-                    last_heartbeat = now
-                    
+                await self.broadcast_heartbeat()
             except Exception as e:
-                logger.error(f"Error in enhanced broadcast loop: {e}")
-                await asyncio.sleep(1)
-    
-    async def broadcast_heartbeat(self):
-        """Enhanced heartbeat with connection stats"""
-        heartbeat_message = {
-            "type": "heartbeat",
-            "timestamp": datetime.now().isoformat(),
-            "data": {
-                "connections": len(self.active_connections),
-                "total_messages_sent": self.message_stats["total_sent"],
-                "total_errors": self.message_stats["errors"],
-                "last_activity": self.message_stats["last_activity"]
-            }
-        }
-        await self.broadcast_to_all(heartbeat_message)
+                logger.error(f"Error sending heartbeat: {e}")
     
-    # ===== LEGACY TRADING BROADCAST METHODS (for compatibility) =====
-    
-    async def broadcast_bot_status(self, status: dict):
-        """Broadcast bot status update"""
-        await self.queue_broadcast("bot_status", status)
-    
-    async def broadcast_new_trade(self, trade: dict):
-        """Broadcast new trade information"""
-        await self.queue_broadcast("new_trade", trade, priority="high")
-    
-    async def broadcast_position_update(self, position: dict):
-        """Broadcast position update"""
-        await self.queue_broadcast("position_update", position)
+    async def _drain_and_broadcast(self, first_entry: Any):
+        """Drain everything already queued and send it as few frames as possible
+        
+        Normal-priority messages are coalesced into a single "batch" frame;
+        high-priority ones flush the pending batch and go out on their own,
+        so ordering is preserved.
+        """
+        batch = []
+        entry = first_entry
+        
+        while True:
+            if isinstance(entry, str):
+                # Placeholder for a coalesced type: send its latest value
+                entry = self._latest_by_type.pop(entry)
+            
+            priority, payload = entry
+            backlogged = False
+            if priority == "high":
+                backlogged = self._flush_batch(batch)
+                batch = []
+                backlogged = self._broadcast_payload(payload) or backlogged
+            else:
+                batch.append(payload)
+                if len(batch) >= self.MAX_BATCH_SIZE:
+                    backlogged = self._flush_batch(batch)
+                    batch = []
+            if backlogged:
+                # Let the client writers catch up before sending more
+                await asyncio.sleep(0)
+            
+            try:
+                entry = self.broadcast_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if entry is None:
+                # Stop wake-up from stop_broadcast_loop
+                break
+        
+        self._flush_batch(batch)
     
-    async def broadcast_market_data(self, market_data: dict):
-        """Broadcast market data update"""
-        await self.queue_broadcast("market_data", market_data)
+    def _flush_batch(self, batch: List[bytes]) -> bool:
+        """Broadcast a list of queued payloads as one frame (see _broadcast_payload)"""
+        if not batch:
+            return False
+        return self._broadcast_payload(self._batch_frame(batch))
+    
+    @staticmethod
+    def _batch_frame(batch: List[bytes]) -> bytes:
+        """Wrap encoded payloads in a "batch" envelope (a single one is sent as is)"""
+        if len(batch) == 1:
+            return batch[0]
+        # Splice the already-encoded messages into the envelope
+        return (
+            b'{"type":"batch","messages":[' + b",".join(batch) +
+            b'],"timestamp":' + _encode(iso_now_ms()) + b"}"
+        )
     
-    async def broadcast_analytics_update(self, analytics: dict):
-        """Broadcast analytics update"""
-        await self.queue_broadcast("analytics", analytics)
+    async def broadcast_heartbeat(self):
+        """Enhanced heartbeat with connection stats (at most one per HEARTBEAT_MIN_GAP)"""
+        if not self.active_connections:
+            return
+        
+        now = time.monotonic()
+        if now - self._last_heartbeat < self.HEARTBEAT_MIN_GAP:
+            return
+        self._last_heartbeat = now
+        
+        # The template is encoded right away, so mutating it in place is safe
+        data = self._heartbeat_data
+        data["connections"] = len(self.active_connections)
+        data["total_messages_sent"] = self.message_stats["total_sent"]
+        data["total_errors"] = self.message_stats["errors"]
+        data["last_activity"] = self.message_stats["last_activity"]
+        self._heartbeat_message["timestamp"] = datetime.now()
+        self.broadcast_sync(_encode(self._heartbeat_message))
+    
+    # ===== TRADING BROADCAST METHODS =====
+    
+    async def broadcast(self, kind: str, data: Any):
+        """Broadcast a trading update (bot_status, new_trade, position_update,
+        market_data, analytics, ...), routed by kind
+        
+        Trades jump the batch as high priority; market data skips the queue and
+        is coalesced per symbol.
+        """
+        route = self.BROADCAST_ROUTES.get(kind)
+        if route == "coalesce":
+            self._buffer_market_data(data)
+        else:
+            await self.queue_broadcast(kind, data, priority=route or "normal")
+    
+    def _buffer_market_data(self, data: Any):
+        """Keep only the latest tick per symbol until the next flush"""
+        if not self.active_connections:
+            return
+        
+        symbol = data.get("symbol") if isinstance(data, dict) else None
+        if symbol is None:
+            # Nothing to coalesce on
+            self.broadcast_sync(_encode(BroadcastMessage("market_data", data, iso_now_ms())))
+            return
+        
+        self._market_data_buffer[symbol] = BroadcastMessage("market_data", data, iso_now_ms())
+        if self._market_data_flush is None:
+            self._market_data_flush = asyncio.get_running_loop().call_later(
+                self.MARKET_DATA_FLUSH_INTERVAL, self._flush_market_data
+            )
+    
+    def _flush_market_data(self):
+        """Send the buffered market data ticks as one frame"""
+        self._market_data_flush = None
+        buffer, self._market_data_buffer = self._market_data_buffer, {}
+        if buffer:
+            self.broadcast_sync(self._batch_frame([_encode(message) for message in buffer.values()]))
     
     async def broadcast_error(self, error: str, details: dict = None):
         """Broadcast error information"""
         error_data = {
             "message": error,
             "details": details or {},
-            "timestamp": datetime.now().isoformat()
+            "timestamp": iso_now_ms()
         }
-        await self.queue_broadcast("error", error_data, priority="high")
+        await self.broadcast("error", error_data)
     
     # ===== MONITORING AND STATS METHODS =====
     
@@ -288,23 +616,27 @@ class WebSocketManager:
             "client_metadata": self.client_metadata,
             "message_stats": self.message_stats,
             "queue_size": self.broadcast_queue.qsize(),
+            "dropped_broadcasts": self._dropped_broadcasts,
             "is_running": self._running
         }
     
-    def get_client_info(self, client_id: str) -> Optional[Dict[str, Any]]:
+    def get_client_info(self, client_id: int) -> Optional[Dict[str, Any]]:
         """Get information about a specific client"""
         return self.client_metadata.get(client_id)
     
-    async def ping_client(self, client_id: str) -> bool:
+    async def ping_client(self, client_id: int) -> bool:
         """Ping a specific client to test connection"""
+        if client_id not in self.active_connections:
+            return False
+        
         try:
             ping_message = {
                 "type": "ping",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": datetime.now(),
                 "client_id": client_id
             }
-            await self.send_to_client(client_id, ping_message)
-            return True
+            # False when the client's queue was full and it has been dropped
+            return await self.send_to_client(client_id, ping_message)
         except Exception as e:
             logger.error(f"Failed to ping client {client_id}: {e}")
             return False
@@ -312,4 +644,10 @@ class WebSocketManager:
     def stop_broadcast_loop(self):
         """Stop the broadcast loop"""
         self._running = False
+        # Wake the loop so it notices without waiting for the next heartbeat;
+        # a full queue means it is awake anyway
+        try:
+            self.broadcast_queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
         logger.info("🛑 Enhanced WebSocket broadcast loop stopped") 
\ No newline at end of file
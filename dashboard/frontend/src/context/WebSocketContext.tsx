@@ -29,6 +29,21 @@ export const WebSocketContext = createContext<UseWebSocketReturn | undefined>(
   undefined
 );
 
+const textDecoder = new TextDecoder();
+
+// First byte of a binary frame whose remaining bytes are zlib-compressed JSON
+const ZLIB_FRAME_TAG = 0x01;
+
+const decodeFrame = async (data: string | ArrayBuffer): Promise<string> => {
+  if (typeof data === "string") return data;
+  const bytes = new Uint8Array(data);
+  if (bytes[0] !== ZLIB_FRAME_TAG) return textDecoder.decode(bytes);
+  const stream = new Blob([bytes.subarray(1)])
+    .stream()
+    .pipeThrough(new DecompressionStream("deflate"));
+  return new Response(stream).text();
+};
+
 interface WebSocketProviderProps {
   children: ReactNode;
   url?: string;
@@ -76,9 +91,11 @@ export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectCountRef = useRef(0);
   const reconnectTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+  // Frames are decoded one after another so async decompression can't reorder them
+  const decodeChainRef = useRef<Promise<void>>(Promise.resolve());
 
-  const handleWebSocketMessage = useCallback((event: MessageEvent) => {
-    const message = JSON.parse(event.data);
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  const processMessage = useCallback((message: any) => {
     console.log("Received WebSocket message:", message);
 
     setConnectionStats((prev) => ({
@@ -167,6 +184,27 @@ export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({
     }
   }, []);
 
+  const handleWebSocketMessage = useCallback(
+    (event: MessageEvent) => {
+      // The backend sends UTF-8 JSON as binary frames, zlib-compressed when large
+      decodeChainRef.current = decodeChainRef.current
+        .then(() => decodeFrame(event.data))
+        .then((text) => {
+          const message = JSON.parse(text);
+          // The backend coalesces bursts of queued broadcasts into one frame
+          if (message.type === "batch") {
+            message.messages.forEach(processMessage);
+          } else {
+            processMessage(message);
+          }
+        })
+        .catch((error) => {
+          console.error("Failed to decode WebSocket message:", error);
+        });
+    },
+    [processMessage]
+  );
+
   const disconnect = useCallback(() => {
     if (reconnectTimeoutRef.current) clearTimeout(reconnectTimeoutRef.current);
     if (wsRef.current) {
@@ -183,6 +221,8 @@ export const WebSocketProvider: React.FC<WebSocketProviderProps> = ({
 
     try {
       const socket = new WebSocket(url);
+      // ArrayBuffer (not Blob) frames can be decoded synchronously, in order
+      socket.binaryType = "arraybuffer";
       wsRef.current = socket;
 
       socket.onopen = () => {
@@ -7,14 +7,35 @@ Supports both regular and hot reload modes
 
 import sys
 import os
+import importlib.util
 import subprocess
 import time
 import signal
 import argparse
 
-def start_server(hot_reload=False):
+def fast_server_args():
+    """uvicorn flags for the fastest event loop / protocol setup available
+    
+    uvicorn[standard] ships uvloop, httptools and websockets, but uvloop is not
+    available on Windows, so each one is only requested if it can be imported.
+    """
+    args = []
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop"):
+        args += ["--loop", "uvloop"]
+    if importlib.util.find_spec("httptools"):
+        args += ["--http", "httptools"]
+    if importlib.util.find_spec("websockets"):
+        args += ["--ws", "websockets"]
+    # The app already compresses large broadcast frames once for all clients;
+    # per-connection deflate would recompress every frame for every client
+    args += ["--ws-per-message-deflate", "false"]
+    return args
+
+def start_server(hot_reload=False, production=False):
     """Start the FastAPI server with proper configuration"""
-    mode = "Hot Reload" if hot_reload else "Standard"
+    if production:
+        hot_reload = False
+    mode = "Production" if production else "Hot Reload" if hot_reload else "Standard"
     print(f"🚀 Starting HyperLiquid AI Trading Bot Dashboard Server ({mode} Mode)")
     print("=" * 60)
     
@@ -50,10 +71,14 @@ def start_server(hot_reload=False):
         print(f"\n🔧 Starting FastAPI server in {mode} mode...")
         print("   Host: 127.0.0.1")
         print("   Port: 8000")
-        print("   Auto-reload: Enabled")
+        print(f"   Auto-reload: {'Disabled' if production else 'Enabled'}")
         print("   Log level: info")
+        server_args = fast_server_args()
+        print(f"   Server backends: {' '.join(server_args) or 'uvicorn defaults'}")
         
-        if hot_reload:
+        if production:
+            print("   🏭 Single worker, no file watcher")
+        elif hot_reload:
             print("   🔥 Hot reload: Jurigged (Python hot patching)")
         else:
             print("   🔄 Hot reload: Uvicorn (process restart)")
@@ -81,7 +106,22 @@ def start_server(hot_reload=False):
                 "--port", "8000",
                 "--reload",  # Keep uvicorn's reload as backup
                 "--log-level", "info",
-                "--access-log"
+                "--access-log",
+                *server_args
+            ]
+        elif production:
+            # No reloader process or file watching. Stays at one worker: the bot
+            # controller, state sync and WebSocket clients all live in-process,
+            # so extra workers would each see only part of the dashboard.
+            cmd = [
+                sys.executable, "-m", "uvicorn",
+                "backend.app:app",
+                "--host", "127.0.0.1",
+                "--port", "8000",
+                "--workers", "1",
+                "--log-level", "info",
+                "--no-access-log",
+                *server_args
             ]
         else:
             # Standard uvicorn with restart-based reload
@@ -92,9 +132,18 @@ def start_server(hot_reload=False):
                 "--port", "8000",
                 "--reload",
                 "--log-level", "info",
-                "--access-log"
+                "--access-log",
+                *server_args
             ]
         
+        if sys.platform != "win32":
+            # Become uvicorn instead of babysitting it as a child process;
+            # uvicorn handles Ctrl+C itself. Flush first, exec discards buffers.
+            sys.stdout.flush()
+            os.execvp(cmd[0], cmd)
+        
+        # os.exec* on Windows spawns a new process and exits the current one,
+        # which detaches the server from the console, so keep a child there
         process = subprocess.Popen(cmd)
         
         # Handle Ctrl+C gracefully
@@ -130,6 +179,7 @@ Examples:
   python start_server.py           # Standard mode with uvicorn reload
   python start_server.py --hot     # Hot reload mode with jurigged
   python start_server.py --hotreload  # Alternative flag for hot reload
+  python start_server.py --prod    # No reload / file watching, for long-running use
         """
     )
     
@@ -139,10 +189,16 @@ Examples:
         help="Enable hot reload mode with jurigged (instant code updates)"
     )
     
+    parser.add_argument(
+        "--prod",
+        action="store_true",
+        help="Run without auto-reload or access logging (long-running deployments)"
+    )
+    
     args = parser.parse_args()
     
     try:
-        start_server(hot_reload=args.hot)
+        start_server(hot_reload=args.hot, production=args.prod)
     except KeyboardInterrupt:
         print("\n⏹️ Server startup cancelled by user")
         sys.exit(0)
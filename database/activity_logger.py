@@ -3,193 +3,271 @@ Activity Logger - Enhanced logging for AI decisions and trading activity
 Handles real-time activity logging for dashboard journal functionality
 """
 
-import sqlite3
+import atexit
+import itertools
+import queue
+import threading
 from datetime import datetime
-import json
-from colorama import Fore, Style
+from database.console import Fore, Style
 import logging
 
+from database.connection import LOCAL_NOW_SQL, open_connection
+from database.json_codec import dumps, loads
+
 logger = logging.getLogger(__name__)
 
+# Hot-path statements, kept as constants so every call hands sqlite3 the same
+# SQL text and hits its prepared-statement cache
+_INSERT_TRADE_SQL = f"""
+    INSERT INTO trade_logs (
+        timestamp, token, current_price, allora_prediction, 
+        prediction_difference_percent, volatility_24h,
+        trade_direction, entry_price, market_condition, reason
+    ) VALUES ({LOCAL_NOW_SQL}, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_AI_DECISION_SQL = f"""
+    INSERT INTO ai_decisions (
+        timestamp, token, provider, decision_type, confidence,
+        risk_score, approval, reasoning, metadata, prediction_value, api_latency
+    ) VALUES ({LOCAL_NOW_SQL}, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Columns returned by the activity_stream getters
+_ACTIVITY_COLUMNS = (
+    'id', 'timestamp', 'activity_type', 'token', 'title', 'description',
+    'data', 'severity', 'category',
+)
+
+_SELECT_ACTIVITY_SQL = f"SELECT {', '.join(_ACTIVITY_COLUMNS)} FROM activity_stream"
+
+_INSERT_ACTIVITY_SQL = f"""
+    INSERT INTO activity_stream (
+        timestamp, activity_type, token, title, description, data, severity, category
+    ) VALUES ({LOCAL_NOW_SQL}, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 class ActivityLogger:
-    """Enhanced logging system for AI decisions, predictions, and trading activity"""
+    """Enhanced logging system for AI decisions, predictions, and trading activity
+    
+    Log writes are queued and committed by a background thread, so callers
+    in the trading loop never wait on SQLite; call flush() to wait for them.
+    """
+    
+    # Max queued log entries committed in one transaction
+    WRITE_BATCH_SIZE = 256
     
     def __init__(self, db_path='trading_logs.db'):
         self.db_path = db_path
+        
+        # One connection for the lifetime of the logger, shared between
+        # threads and serialized by the lock
+        self._conn = None
+        self._conn_path = None
+        self._lock = threading.Lock()
         self._create_activity_tables()
+        
+        # Sequence number shown as [LOG-n] on log_trade's console output
+        self._log_ids = itertools.count(1)
+        
+        self._write_queue = queue.Queue()
+        threading.Thread(target=self._writer_loop, name="activity-log-writer", daemon=True).start()
+        # The writer is a daemon thread; don't lose queued entries on exit
+        atexit.register(self.flush)
+    
+    def _connection(self):
+        """Return the shared connection, reopening it if db_path has changed
+        
+        Callers must hold self._lock.
+        """
+        if self._conn is None or self._conn_path != self.db_path:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = open_connection(self.db_path)
+            self._conn_path = self.db_path
+        return self._conn
+    
+    def close(self):
+        """Write any queued log entries, then close the shared connection"""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
     
     def _create_activity_tables(self):
         """Create activity logging tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Enhanced trade logs table (existing)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS trade_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                token TEXT,
-                current_price REAL,
-                allora_prediction REAL,
-                prediction_difference_percent REAL,
-                volatility_24h REAL,
-                trade_direction TEXT,
-                entry_price REAL,
-                market_condition TEXT,
-                reason TEXT,
-                exit_price REAL,
-                profit_loss_percent REAL,
-                trade_result TEXT
-            )
-        """)
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        # AI decisions table (new)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS ai_decisions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                token TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                decision_type TEXT NOT NULL,
-                confidence REAL,
-                risk_score REAL,
-                approval BOOLEAN,
-                reasoning TEXT,
-                metadata TEXT,
-                prediction_value REAL,
-                api_latency REAL
-            )
-        """)
+            # Enhanced trade logs table (existing)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS trade_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    token TEXT,
+                    current_price REAL,
+                    allora_prediction REAL,
+                    prediction_difference_percent REAL,
+                    volatility_24h REAL,
+                    trade_direction TEXT,
+                    entry_price REAL,
+                    market_condition TEXT,
+                    reason TEXT,
+                    exit_price REAL,
+                    profit_loss_percent REAL,
+                    trade_result TEXT
+                )
+            """)
         
-        # Activity stream table (new)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS activity_stream (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                activity_type TEXT NOT NULL,
-                token TEXT,
-                title TEXT NOT NULL,
-                description TEXT,
-                data TEXT,
-                severity TEXT DEFAULT 'INFO',
-                category TEXT DEFAULT 'GENERAL'
-            )
-        """)
+            # AI decisions table (new)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ai_decisions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    token TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    decision_type TEXT NOT NULL,
+                    confidence REAL,
+                    risk_score REAL,
+                    approval BOOLEAN,
+                    reasoning TEXT,
+                    metadata TEXT,
+                    prediction_value REAL,
+                    api_latency REAL
+                )
+            """)
         
-        conn.commit()
-        conn.close()
+            # Activity stream table (new)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS activity_stream (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    activity_type TEXT NOT NULL,
+                    token TEXT,
+                    title TEXT NOT NULL,
+                    description TEXT,
+                    data TEXT,
+                    severity TEXT DEFAULT 'INFO',
+                    category TEXT DEFAULT 'GENERAL'
+                )
+            """)
+            
+            # Dashboard reads are "latest N", optionally filtered by token and type
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_activity_ts
+                ON activity_stream(timestamp DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_activity_token_type_ts
+                ON activity_stream(token, activity_type, timestamp DESC)
+            """)
+
+            # AdaptiveThresholds reads one token's trades over the last N days
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_trade_logs_token_ts
+                ON trade_logs(token, timestamp)
+            """)
+
+            conn.commit()
         logger.info("Activity logging tables initialized")
     
     def log_trade(self, trade_data):
         """Log trade with enhanced formatting and activity stream"""
-        log_id = datetime.now().strftime("%Y%m%d%H%M%S")
+        log_id = next(self._log_ids)
         
-        # Console logging with colors
-        print(f"{Fore.GREEN}[LOG-{log_id}] Trade Activity:{Style.RESET_ALL}")
-        print(f"  {Fore.CYAN}Token:{Style.RESET_ALL} {trade_data['token']}")
-        print(f"  {Fore.CYAN}Direction:{Style.RESET_ALL} {trade_data['direction']}")
-        print(f"  {Fore.CYAN}Price:{Style.RESET_ALL} ${trade_data['current_price']:.2f}")
-        print(f"  {Fore.CYAN}Prediction:{Style.RESET_ALL} ${trade_data['allora_prediction']:.2f}")
-        print(f"  {Fore.CYAN}Difference:{Style.RESET_ALL} {trade_data['prediction_diff']:.2f}%")
+        # Formatted once for both the console and the activity stream
+        price_text = f"${trade_data['current_price']:.2f}"
+        prediction_text = f"${trade_data['allora_prediction']:.2f}"
+        
+        # Console logging with colors, as a single write
+        print(
+            f"{Fore.GREEN}[LOG-{log_id}] Trade Activity:{Style.RESET_ALL}\n"
+            f"  {Fore.CYAN}Token:{Style.RESET_ALL} {trade_data['token']}\n"
+            f"  {Fore.CYAN}Direction:{Style.RESET_ALL} {trade_data['direction']}\n"
+            f"  {Fore.CYAN}Price:{Style.RESET_ALL} {price_text}\n"
+            f"  {Fore.CYAN}Prediction:{Style.RESET_ALL} {prediction_text}\n"
+            f"  {Fore.CYAN}Difference:{Style.RESET_ALL} {trade_data['prediction_diff']:.2f}%"
+        )
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
         try:
-            # Insert into trade_logs
-            cursor.execute("""
-                INSERT INTO trade_logs (
-                    timestamp, token, current_price, allora_prediction, 
-                    prediction_difference_percent, volatility_24h,
-                    trade_direction, entry_price, market_condition, reason
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                datetime.now(),
-                trade_data['token'],
-                trade_data['current_price'],
-                trade_data['allora_prediction'],
-                trade_data['prediction_diff'],
-                trade_data['volatility'],
-                trade_data['direction'],
-                trade_data['entry_price'],
-                trade_data['market_condition'],
-                trade_data.get('reason', None)
-            ))
-            
-            # Also log to activity stream
-            self._log_to_activity_stream(
-                cursor,
-                'TRADE_SIGNAL',
-                trade_data['token'],
-                f"{trade_data['direction']} Signal",
-                f"Price: ${trade_data['current_price']:.2f}, Prediction: ${trade_data['allora_prediction']:.2f}",
-                trade_data,
-                'INFO' if trade_data['direction'] == 'HOLD' else 'SUCCESS'
+            # Insert into trade_logs, and also log to activity stream
+            self._queue_write(
+                (_INSERT_TRADE_SQL, self._trade_row(trade_data)),
+                (_INSERT_ACTIVITY_SQL, self._trade_activity_row(trade_data, price_text, prediction_text)),
             )
-
-            conn.commit()
-            print(f"{Fore.GREEN}[LOG-{log_id}] Trade logged successfully{Style.RESET_ALL}")
-
+            print(f"{Fore.GREEN}[LOG-{log_id}] Trade queued for logging{Style.RESET_ALL}")
+        
         except Exception as e:
             print(f"{Fore.RED}[LOG-{log_id}] Error logging trade: {str(e)}{Style.RESET_ALL}")
             logger.error(f"Trade logging error: {e}")
-        finally:
-            conn.close()
+    
+    def log_trades_bulk(self, trades):
+        """Log several trades (and their activity stream entries) in one transaction
+        
+        Written synchronously, after anything already queued.
+        Returns the number of trades written, 0 if the batch was rolled back.
+        """
+        if not trades:
+            return 0
+        
+        self.flush()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
+            
+            try:
+                cursor.executemany(_INSERT_TRADE_SQL, [self._trade_row(t) for t in trades])
+                cursor.executemany(_INSERT_ACTIVITY_SQL, [self._trade_activity_row(t) for t in trades])
+                conn.commit()
+                logger.info(f"Logged {len(trades)} trades in one transaction")
+                return len(trades)
+            
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Bulk trade logging error: {e}")
+                return 0
     
     def log_ai_decision(self, token, provider, decision_data):
         """Log AI provider decision (Hyperbolic, OpenRouter)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
-            cursor.execute("""
-                INSERT INTO ai_decisions (
-                    timestamp, token, provider, decision_type, confidence,
-                    risk_score, approval, reasoning, metadata, prediction_value, api_latency
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                datetime.now(),
-                token,
-                provider,
-                decision_data.get('decision_type', 'VALIDATION'),
-                decision_data.get('confidence', 0),
-                decision_data.get('risk_score', 0),
-                decision_data.get('approval', False),
-                decision_data.get('reasoning', ''),
-                json.dumps(decision_data.get('metadata', {})),
-                decision_data.get('prediction_value'),
-                decision_data.get('api_latency', 0)
-            ))
-            
-            # Log to activity stream
-            approval_status = "✅ APPROVED" if decision_data.get('approval') else "❌ REJECTED"
-            self._log_to_activity_stream(
-                cursor,
-                'AI_DECISION',
-                token,
-                f"{provider} AI Decision",
-                f"{approval_status} - Confidence: {decision_data.get('confidence', 0)}%",
-                decision_data,
-                'SUCCESS' if decision_data.get('approval') else 'WARNING'
+            approved = decision_data.get('approval')
+            confidence = decision_data.get('confidence', 0)
+            approval_status = "✅ APPROVED" if approved else "❌ REJECTED"
+            self._queue_write(
+                (_INSERT_AI_DECISION_SQL, (
+                    token,
+                    provider,
+                    decision_data.get('decision_type', 'VALIDATION'),
+                    confidence,
+                    decision_data.get('risk_score', 0),
+                    decision_data.get('approval', False),
+                    decision_data.get('reasoning', ''),
+                    dumps(decision_data.get('metadata', {})),
+                    decision_data.get('prediction_value'),
+                    decision_data.get('api_latency', 0)
+                )),
+                # Log to activity stream
+                (_INSERT_ACTIVITY_SQL, self._activity_row(
+                    'AI_DECISION',
+                    token,
+                    f"{provider} AI Decision",
+                    f"{approval_status} - Confidence: {confidence}%",
+                    decision_data,
+                    'SUCCESS' if approved else 'WARNING'
+                )),
             )
-            
-            conn.commit()
             logger.info(f"AI decision logged: {provider} for {token}")
-            
+        
         except Exception as e:
             logger.error(f"Error logging AI decision: {e}")
-        finally:
-            conn.close()
     
     def log_allora_prediction(self, token, prediction_data):
         """Log Allora prediction with metadata"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
             # Log to activity stream
             self._log_to_activity_stream(
-                cursor,
                 'ALLORA_PREDICTION',
                 token,
                 f"Allora Prediction - {token}",
@@ -197,20 +275,13 @@ class ActivityLogger:
                 prediction_data,
                 'INFO'
             )
-            
-            conn.commit()
             logger.debug(f"Allora prediction logged for {token}")
-            
+        
         except Exception as e:
             logger.error(f"Error logging Allora prediction: {e}")
-        finally:
-            conn.close()
     
     def log_trade_signal(self, token, signal, price, reasoning):
         """Log trade signal generation"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         try:
             signal_data = {
                 'signal': signal,
@@ -222,7 +293,6 @@ class ActivityLogger:
             severity = 'SUCCESS' if signal in ['BUY', 'SELL'] else 'INFO'
             
             self._log_to_activity_stream(
-                cursor,
                 'TRADE_SIGNAL',
                 token,
                 f"Signal Generated: {signal}",
@@ -230,137 +300,205 @@ class ActivityLogger:
                 signal_data,
                 severity
             )
-            
-            conn.commit()
             logger.debug(f"Trade signal logged: {signal} for {token}")
-            
+        
         except Exception as e:
             logger.error(f"Error logging trade signal: {e}")
-        finally:
-            conn.close()
     
     def get_recent_activity(self, limit=50, filters=None):
         """Get recent activity for dashboard"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            where_clause = "WHERE 1=1"
-            params = []
+            try:
+                where_clause = "WHERE 1=1"
+                params = []
             
-            if filters:
-                if filters.get('token'):
-                    where_clause += " AND token = ?"
-                    params.append(filters['token'])
-                if filters.get('activity_type'):
-                    where_clause += " AND activity_type = ?"
-                    params.append(filters['activity_type'])
-                if filters.get('since'):
-                    where_clause += " AND timestamp >= ?"
-                    params.append(filters['since'])
+                if filters:
+                    if filters.get('token'):
+                        where_clause += " AND token = ?"
+                        params.append(filters['token'])
+                    if filters.get('activity_type'):
+                        where_clause += " AND activity_type = ?"
+                        params.append(filters['activity_type'])
+                    if filters.get('since'):
+                        where_clause += " AND timestamp >= ?"
+                        params.append(filters['since'])
             
-            cursor.execute(f"""
-                SELECT id, timestamp, activity_type, token, title, description, 
-                       data, severity, category
-                FROM activity_stream 
-                {where_clause}
-                ORDER BY timestamp DESC 
-                LIMIT ?
-            """, params + [limit])
+                cursor.execute(f"""
+                    {_SELECT_ACTIVITY_SQL}
+                    {where_clause}
+                    ORDER BY timestamp DESC, id DESC
+                    LIMIT ?
+                """, params + [limit])
             
-            activities = []
-            for row in cursor.fetchall():
-                activities.append({
-                    'id': row[0],
-                    'timestamp': row[1],
-                    'activity_type': row[2],
-                    'token': row[3],
-                    'title': row[4],
-                    'description': row[5],
-                    'data': json.loads(row[6]) if row[6] else {},
-                    'severity': row[7],
-                    'category': row[8]
-                })
+                # Stream rows off the cursor instead of materializing fetchall()
+                return [self._activity_from_row(row) for row in cursor]
             
-            return activities
-            
-        except Exception as e:
-            logger.error(f"Error getting recent activity: {e}")
-            return []
-        finally:
-            conn.close()
+            except Exception as e:
+                logger.error(f"Error getting recent activity: {e}")
+                return []
     
     def get_activity_stream(self, since_timestamp):
         """Get activity stream since timestamp for real-time updates"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                SELECT id, timestamp, activity_type, token, title, description, 
-                       data, severity, category
-                FROM activity_stream 
-                WHERE timestamp > ?
-                ORDER BY timestamp ASC
-            """, (since_timestamp,))
-            
-            activities = []
-            for row in cursor.fetchall():
-                activities.append({
-                    'id': row[0],
-                    'timestamp': row[1],
-                    'activity_type': row[2],
-                    'token': row[3],
-                    'title': row[4],
-                    'description': row[5],
-                    'data': json.loads(row[6]) if row[6] else {},
-                    'severity': row[7],
-                    'category': row[8]
-                })
+            try:
+                cursor.execute(f"""
+                    {_SELECT_ACTIVITY_SQL}
+                    WHERE timestamp > ?
+                    ORDER BY timestamp ASC, id ASC
+                """, (since_timestamp,))
             
-            return activities
+                # Stream rows off the cursor instead of materializing fetchall()
+                return [self._activity_from_row(row) for row in cursor]
             
-        except Exception as e:
-            logger.error(f"Error getting activity stream: {e}")
-            return []
-        finally:
-            conn.close()
+            except Exception as e:
+                logger.error(f"Error getting activity stream: {e}")
+                return []
     
     def update_trade_result(self, trade_id, exit_price, profit_loss, result):
         """Update trade result"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                UPDATE trade_logs 
-                SET exit_price = ?, profit_loss_percent = ?, trade_result = ?
-                WHERE id = ?
-            """, (exit_price, profit_loss, result, trade_id))
+            try:
+                cursor.execute("""
+                    UPDATE trade_logs 
+                    SET exit_price = ?, profit_loss_percent = ?, trade_result = ?
+                    WHERE id = ?
+                """, (exit_price, profit_loss, result, trade_id))
             
-            conn.commit()
-            logger.info(f"Trade result updated for ID {trade_id}: {result}")
-            return True
+                conn.commit()
+                logger.info(f"Trade result updated for ID {trade_id}: {result}")
+                return True
             
-        except Exception as e:
-            logger.error(f"Error updating trade result: {e}")
-            return False
-        finally:
-            conn.close()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error updating trade result: {e}")
+                return False
     
-    def _log_to_activity_stream(self, cursor, activity_type, token, title, description, data, severity='INFO'):
-        """Internal method to log to activity stream"""
-        cursor.execute("""
-            INSERT INTO activity_stream (
-                timestamp, activity_type, token, title, description, data, severity, category
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            datetime.now(),
+    @staticmethod
+    def _activity_from_row(row):
+        """Dashboard dict for an activity_stream row, with its data decoded"""
+        activity = dict(row)
+        data = activity['data']
+        activity['data'] = loads(data) if data else {}
+        return activity
+    
+    @staticmethod
+    def _trade_row(trade_data):
+        """trade_logs parameters for a trade (the timestamp is set by SQLite)"""
+        return (
+            trade_data['token'],
+            trade_data['current_price'],
+            trade_data['allora_prediction'],
+            trade_data['prediction_diff'],
+            trade_data['volatility'],
+            trade_data['direction'],
+            trade_data['entry_price'],
+            trade_data['market_condition'],
+            trade_data.get('reason', None)
+        )
+    
+    @classmethod
+    def _trade_activity_row(cls, trade_data, price_text=None, prediction_text=None):
+        """activity_stream parameters for a trade
+        
+        price_text/prediction_text are the "$x.xx" strings, if already formatted.
+        """
+        if price_text is None:
+            price_text = f"${trade_data['current_price']:.2f}"
+        if prediction_text is None:
+            prediction_text = f"${trade_data['allora_prediction']:.2f}"
+        direction = trade_data['direction']
+        return cls._activity_row(
+            'TRADE_SIGNAL',
+            trade_data['token'],
+            f"{direction} Signal",
+            f"Price: {price_text}, Prediction: {prediction_text}",
+            trade_data,
+            'INFO' if direction == 'HOLD' else 'SUCCESS'
+        )
+    
+    @staticmethod
+    def _activity_row(activity_type, token, title, description, data, severity):
+        """activity_stream parameters for one entry (the timestamp is set by SQLite)"""
+        return (
             activity_type,
             token,
             title,
             description,
-            json.dumps(data) if data else None,
+            dumps(data) if data else None,
             severity,
             'TRADING'
-        )) 
\ No newline at end of file
+        )
+    
+    def _log_to_activity_stream(self, activity_type, token, title, description, data, severity='INFO'):
+        """Internal method to log to activity stream"""
+        self._queue_write((_INSERT_ACTIVITY_SQL, self._activity_row(
+            activity_type, token, title, description, data, severity
+        )))
+    
+    # ===== BACKGROUND WRITER =====
+    
+    def _queue_write(self, *statements):
+        """Hand (sql, params) statements to the writer thread, to be committed together"""
+        self._write_queue.put_nowait(statements)
+    
+    def flush(self):
+        """Block until every queued log entry has been written"""
+        self._write_queue.join()
+    
+    def _writer_loop(self):
+        """Write queued log entries, one transaction per batch drained from the queue"""
+        while True:
+            batch = [self._write_queue.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                self._write_batch(batch)
+            except Exception as e:
+                logger.error(f"Activity log writer error: {e}")
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    def _write_batch(self, batch):
+        """Commit a batch of queued entries; if it fails, retry them one by one"""
+        # One executemany per statement; rows of a table keep their queue order
+        params_by_sql = {}
+        for statements in batch:
+            for sql, params in statements:
+                params_by_sql.setdefault(sql, []).append(params)
+        
+        with self._lock:
+            conn = self._connection()
+            try:
+                for sql, rows in params_by_sql.items():
+                    conn.executemany(sql, rows)
+                conn.commit()
+                return
+            except Exception as e:
+                conn.rollback()
+                if len(batch) == 1:
+                    logger.error(f"Error writing activity log entry: {e}")
+                    return
+            
+            # Don't let one bad entry drop the rest of the batch
+            for statements in batch:
+                try:
+                    for sql, params in statements:
+                        conn.execute(sql, params)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Error writing activity log entry: {e}")
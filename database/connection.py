@@ -0,0 +1,70 @@
+"""
+SQLite connection setup shared by DatabaseManager and ActivityLogger
+"""
+
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+# Applied to every connection; journal_mode=WAL is also persisted in the
+# database file, the others only last for the connection they're set on.
+# synchronous is set separately, from DB_SYNCHRONOUS.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # ~20 MB page cache, kept by the shared connections
+    "PRAGMA mmap_size=268435456",  # 256 MB
+)
+
+# NORMAL only syncs the WAL at checkpoints: a power loss can drop the last
+# commits but never corrupts the file. FULL also syncs every commit.
+DEFAULT_SYNCHRONOUS = "NORMAL"
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+
+# SQL expression for the current local time, in the same layout (and sort
+# order) as sqlite3's datetime adapter; lets SQLite stamp rows instead of
+# binding a Python datetime per insert
+LOCAL_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+# Prepared statements kept per connection (sqlite3 defaults to 128); a shared
+# connection runs every query of its owner
+STATEMENT_CACHE_SIZE = 256
+
+def configure_connection(conn):
+    """Switch a connection to WAL with relaxed fsync and in-memory temp storage"""
+    cursor = conn.cursor()
+    for pragma in CONNECTION_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.execute(f"PRAGMA synchronous={synchronous_mode()}")
+
+    # In-memory databases and some filesystems can't use WAL and silently
+    # keep their journal mode
+    journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+    if journal_mode.lower() != "wal":
+        logger.warning(f"SQLite WAL not enabled, journal_mode={journal_mode}")
+    return conn
+
+def synchronous_mode():
+    """PRAGMA synchronous level from DB_SYNCHRONOUS (e.g. FULL on mainnet), default NORMAL"""
+    mode = os.getenv("DB_SYNCHRONOUS", DEFAULT_SYNCHRONOUS).upper()
+    if mode not in SYNCHRONOUS_MODES:
+        logger.warning(f"Invalid DB_SYNCHRONOUS={mode}, using {DEFAULT_SYNCHRONOUS}")
+        return DEFAULT_SYNCHRONOUS
+    return mode
+
+def open_connection(db_path):
+    """Open a configured connection that can be shared between threads
+    
+    sqlite3 connections refuse to be used from another thread by default;
+    callers sharing one must serialize access themselves.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    # Rows index by position and by column name, and convert with dict(row)
+    conn.row_factory = sqlite3.Row
+    return configure_connection(conn)
@@ -0,0 +1,22 @@
+"""
+Console colors for the database modules
+
+Color codes are only emitted when stdout is a terminal and colorama is
+installed; otherwise every Fore/Style attribute is an empty string.
+"""
+
+import sys
+
+class _NoColor:
+    """Stands in for colorama's Fore/Style with empty strings"""
+
+    def __getattr__(self, name):
+        return ""
+
+if sys.stdout is not None and sys.stdout.isatty():
+    try:
+        from colorama import Fore, Style
+    except ImportError:
+        Fore = Style = _NoColor()
+else:
+    Fore = Style = _NoColor()
@@ -3,128 +3,298 @@ Core Database Manager - Handles crypto configuration and bot commands
 Refactored to focus on core database operations (≤350 lines)
 """
 
-import sqlite3
+import atexit
+import queue
+import threading
+import time
 from datetime import datetime
 import os
-import json
 import uuid
-from colorama import Fore, Style
+from database.console import Fore, Style
 import logging
 
+from database.connection import LOCAL_NOW_SQL, open_connection
+from database.json_codec import dumps_bytes
+
 logger = logging.getLogger(__name__)
 
+# crypto_configs writes, kept as constants so each call hands sqlite3 the same
+# SQL text and hits its prepared-statement cache
+_INSERT_CRYPTO_SQL = f"""
+    INSERT INTO crypto_configs 
+    (symbol, topic_id, is_active, availability, 
+     hyperliquid_available, allora_available, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, {LOCAL_NOW_SQL})
+"""
+
+# Updates an existing symbol's row in place (keeping its id and added_at)
+# rather than INSERT OR REPLACE's delete + reinsert
+_UPSERT_CRYPTO_CONFLICT_SQL = f"""
+    ON CONFLICT(symbol) DO UPDATE SET
+        topic_id = excluded.topic_id,
+        is_active = excluded.is_active,
+        availability = excluded.availability,
+        hyperliquid_available = excluded.hyperliquid_available,
+        allora_available = excluded.allora_available,
+        last_price = excluded.last_price,
+        volume_24h = excluded.volume_24h,
+        updated_at = {LOCAL_NOW_SQL}
+"""
+
+_UPSERT_CRYPTO_SQL = f"""
+    INSERT INTO crypto_configs 
+    (symbol, topic_id, is_active, availability, 
+     hyperliquid_available, allora_available, 
+     last_price, volume_24h, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, {LOCAL_NOW_SQL})
+    {_UPSERT_CRYPTO_CONFLICT_SQL}
+"""
+
+# bulk_upsert_crypto_configs: bound columns of _UPSERT_CRYPTO_SQL, and rows
+# per multi-row statement (800 parameters, under SQLite's older 999 limit)
+_UPSERT_CRYPTO_COLUMNS = ('symbol', 'topic_id', 'is_active', 'availability',
+                          'hyperliquid_available', 'allora_available',
+                          'last_price', 'volume_24h')
+_UPSERT_CRYPTO_CHUNK = 100
+
+# Shared by activate_crypto, deactivate_crypto and set_cryptos_active
+_SET_CRYPTO_ACTIVE_SQL = f"""
+    UPDATE crypto_configs 
+    SET is_active = ?, updated_at = {LOCAL_NOW_SQL}
+    WHERE symbol = ?
+"""
+
+# crypto_configs BOOLEAN columns (stored as 0/1)
+_CONFIG_FLAGS = ('is_active', 'hyperliquid_available', 'allora_available')
+
+# Command files queued by every DatabaseManager in the process, written off
+# the callers' threads (the dashboard's request handlers) by one daemon
+# thread, started with the first command
+_command_queue = queue.Queue()
+_command_writer = None
+_command_writer_lock = threading.Lock()
+
+def _start_command_writer():
+    """Start the shared command writer thread, once per process"""
+    global _command_writer
+    with _command_writer_lock:
+        if _command_writer is None:
+            _command_writer = threading.Thread(
+                target=_command_writer_loop, name="command-file-writer", daemon=True
+            )
+            _command_writer.start()
+            # The writer is a daemon thread; don't lose queued commands on exit
+            atexit.register(flush_commands)
+
+def flush_commands():
+    """Block until every queued command file has been written"""
+    _command_queue.join()
+
+def _command_writer_loop():
+    """Write queued command files in the order they were added"""
+    while True:
+        command_dir, command_type, command_id, payload = _command_queue.get()
+        try:
+            _write_command_file(command_dir, command_id, payload)
+        except Exception as e:
+            print(f"❌ Error creating command file for {command_type}: {e}")
+            logger.error(f"Error creating command file for {command_type}: {e}")
+        finally:
+            _command_queue.task_done()
+
+def _write_command_file(command_dir, command_id, payload):
+    """Write one serialized command to a pending directory"""
+    file_path = os.path.join(command_dir, f"{command_id}.json")
+    tmp_path = f"{file_path}.tmp"
+
+    try:
+        f = open(tmp_path, "wb")
+    except FileNotFoundError:
+        # First command, or tmp/ was cleared since
+        os.makedirs(command_dir, exist_ok=True)
+        f = open(tmp_path, "wb")
+    with f:
+        f.write(payload)
+    # The bot only picks up *.json files, and the rename is atomic, so it
+    # never reads a half-written command
+    os.replace(tmp_path, file_path)
+
+    print(f"📨 Fichier de commande créé : {file_path}")
+    logger.info(f"Command file created: {file_path}")
+
 class DatabaseManager:
     """Core database operations for crypto configuration and bot command management"""
     
+    # Seconds a get_database_stats result is reused for
+    STATS_CACHE_TTL = 5.0
+    
     def __init__(self):
         # Use environment variable if available, otherwise default to trading_logs.db
         self.db_path = os.getenv('DB_PATH', 'trading_logs.db')
         self.project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        # File-based command queue read by the bot (AlloraMind.check_dashboard_commands)
+        self._command_dir = os.path.join(self.project_root, "tmp", "commands", "pending")
         logger.info(f"Initializing database at {self.db_path}")
+        
+        # One connection for the lifetime of the manager, shared between
+        # threads and serialized by the lock
+        self._conn = None
+        self._conn_path = None
+        self._lock = threading.Lock()
+        
+        # get_active_cryptos/get_crypto_configs results and the PRAGMA
+        # data_version they were read at; get_database_stats result and when
+        # (monotonic) it was computed
+        self._active_cache = None
+        self._active_cache_version = None
+        self._configs_cache = None
+        self._configs_cache_version = None
+        self._stats_cache = (float("-inf"), None)
+        
+        # Created on first use by the ActivityLogger compatibility methods
+        self._activity_logger = None
         self._create_tables()
     
+    def _connection(self):
+        """Return the shared connection, reopening it if db_path has changed
+        
+        Callers must hold self._lock.
+        """
+        if self._conn is None or self._conn_path != self.db_path:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = open_connection(self.db_path)
+            self._conn_path = self.db_path
+            self._invalidate_caches()
+        return self._conn
+    
+    def _invalidate_caches(self):
+        """Forget cached reads after this manager changes crypto_configs"""
+        self._active_cache = None
+        self._configs_cache = None
+        self._stats_cache = (float("-inf"), None)
+    
+    def close(self):
+        """Write any queued command files, then close the shared connection"""
+        self.flush_commands()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        if self._activity_logger is not None:
+            self._activity_logger.close()
+    
     def _create_tables(self):
         """Create core database tables"""
         logger.info("Creating core database tables...")
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        # Crypto configuration table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS crypto_configs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                symbol TEXT UNIQUE NOT NULL,
-                topic_id INTEGER NOT NULL,
-                is_active BOOLEAN DEFAULT FALSE,
-                availability TEXT NOT NULL,
-                hyperliquid_available BOOLEAN DEFAULT FALSE,
-                allora_available BOOLEAN DEFAULT FALSE,
-                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_price REAL,
-                volume_24h REAL
-            )
-        """)
+            # Crypto configuration table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS crypto_configs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    symbol TEXT UNIQUE NOT NULL,
+                    topic_id INTEGER NOT NULL,
+                    is_active BOOLEAN DEFAULT FALSE,
+                    availability TEXT NOT NULL,
+                    hyperliquid_available BOOLEAN DEFAULT FALSE,
+                    allora_available BOOLEAN DEFAULT FALSE,
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    last_price REAL,
+                    volume_24h REAL
+                )
+            """)
+            
+            # Symbol lookups already use the UNIQUE index; the bot polls for
+            # the (few) active rows. SQLite only treats a partial index as
+            # covering when it also holds the WHERE column, hence is_active.
+            cursor.execute("DROP INDEX IF EXISTS idx_crypto_active")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_crypto_active_symbol
+                ON crypto_configs(is_active, symbol, topic_id) WHERE is_active = TRUE
+            """)
         
-        # Bot commands table (now handled by file-based queue)
-        # cursor.execute("""
-        #     CREATE TABLE IF NOT EXISTS bot_commands (
-        #         id INTEGER PRIMARY KEY AUTOINCREMENT,
-        #         command_type TEXT NOT NULL,
-        #         command_data TEXT,
-        #         status TEXT DEFAULT 'PENDING',
-        #         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        #         executed_at TIMESTAMP,
-        #         error_message TEXT
-        #     )
-        # """)
+            # Bot commands table (now handled by file-based queue)
+            # cursor.execute("""
+            #     CREATE TABLE IF NOT EXISTS bot_commands (
+            #         id INTEGER PRIMARY KEY AUTOINCREMENT,
+            #         command_type TEXT NOT NULL,
+            #         command_data TEXT,
+            #         status TEXT DEFAULT 'PENDING',
+            #         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            #         executed_at TIMESTAMP,
+            #         error_message TEXT
+            #     )
+            # """)
         
-        conn.commit()
-        conn.close()
+            conn.commit()
         logger.info("Core database tables initialized successfully")
 
     # ===== CRYPTO CONFIGURATION METHODS =====
     
     def get_crypto_configs(self):
         """Get all crypto configurations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                SELECT symbol, topic_id, is_active, availability, 
-                       hyperliquid_available, allora_available, 
-                       last_price, volume_24h, updated_at
-                FROM crypto_configs
-                ORDER BY symbol
-            """)
-            
-            configs = []
-            for row in cursor.fetchall():
-                configs.append({
-                    'symbol': row[0],
-                    'topic_id': row[1],
-                    'is_active': bool(row[2]),
-                    'availability': row[3],
-                    'hyperliquid_available': bool(row[4]),
-                    'allora_available': bool(row[5]),
-                    'last_price': row[6],
-                    'volume_24h': row[7],
-                    'updated_at': row[8]
-                })
+            try:
+                # Same invalidation as get_active_cryptos
+                version = cursor.execute("PRAGMA data_version").fetchone()[0]
+                if self._configs_cache is None or version != self._configs_cache_version:
+                    cursor.execute("""
+                        SELECT symbol, topic_id, is_active, availability, 
+                               hyperliquid_available, allora_available, 
+                               last_price, volume_24h, updated_at
+                        FROM crypto_configs
+                        ORDER BY symbol
+                    """)
+                    self._configs_cache = [self._config_from_row(row) for row in cursor]
+                    self._configs_cache_version = version
             
-            return configs
+                return [dict(config) for config in self._configs_cache]
             
-        except Exception as e:
-            logger.error(f"Error getting crypto configs: {e}")
-            return []
-        finally:
-            conn.close()
+            except Exception as e:
+                logger.error(f"Error getting crypto configs: {e}")
+                return []
+    
+    @staticmethod
+    def _config_from_row(row):
+        """Config dict for a crypto_configs row, with its flag columns as bools"""
+        config = dict(row)
+        for flag in _CONFIG_FLAGS:
+            config[flag] = bool(config[flag])
+        return config
     
     def get_active_cryptos(self):
         """Get only active crypto configurations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                SELECT symbol, topic_id 
-                FROM crypto_configs 
-                WHERE is_active = TRUE
-                ORDER BY symbol
-            """)
-            
-            active_cryptos = {}
-            for row in cursor.fetchall():
-                active_cryptos[row[0]] = row[1]  # {symbol: topic_id}
+            try:
+                # data_version only moves when another connection (the dashboard
+                # or the bot process) commits; our own writes clear the cache
+                version = cursor.execute("PRAGMA data_version").fetchone()[0]
+                if self._active_cache is None or version != self._active_cache_version:
+                    # {symbol: topic_id}, built from the rows in C
+                    self._active_cache = dict(cursor.execute("""
+                        SELECT symbol, topic_id 
+                        FROM crypto_configs 
+                        WHERE is_active = TRUE
+                        ORDER BY symbol
+                    """))
+                    self._active_cache_version = version
             
-            return active_cryptos
+                # Callers mutate the dict they get back
+                return dict(self._active_cache)
             
-        except Exception as e:
-            logger.error(f"Error getting active cryptos: {e}")
-            return {}
-        finally:
-            conn.close()
+            except Exception as e:
+                logger.error(f"Error getting active cryptos: {e}")
+                return {}
     
     def add_crypto_config(self, symbol, topic_id, availability, 
                         hyperliquid_available=None, allora_available=None):
@@ -135,132 +305,229 @@ class DatabaseManager:
         if allora_available is None:
             allora_available = availability in ['both', 'allora']
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                INSERT INTO crypto_configs 
-                (symbol, topic_id, is_active, availability, 
-                 hyperliquid_available, allora_available, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                symbol, topic_id, False, availability,
-                hyperliquid_available, allora_available, datetime.now()
-            ))
+            try:
+                cursor.execute(_INSERT_CRYPTO_SQL, (
+                    symbol, topic_id, False, availability,
+                    hyperliquid_available, allora_available
+                ))
             
-            conn.commit()
-            config_id = cursor.lastrowid
-            logger.info(f"Added crypto config: {symbol} (ID: {config_id})")
-            return config_id
+                conn.commit()
+                self._invalidate_caches()
+                config_id = cursor.lastrowid
+                logger.info(f"Added crypto config: {symbol} (ID: {config_id})")
+                return config_id
             
-        except Exception as e:
-            logger.error(f"Error adding crypto config for {symbol}: {e}")
-            return None
-        finally:
-            conn.close()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Error adding crypto config for {symbol}: {e}")
+                return None
 
     def update_crypto_config(self, symbol, topic_id, is_active, availability, 
                            hyperliquid_available=False, allora_available=False,
                            last_price=None, volume_24h=None):
         """Insert or update crypto configuration"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO crypto_configs 
-                (symbol, topic_id, is_active, availability, 
-                 hyperliquid_available, allora_available, 
-                 last_price, volume_24h, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                symbol, topic_id, is_active, availability,
-                hyperliquid_available, allora_available,
-                last_price, volume_24h, datetime.now()
-            ))
+            try:
+                cursor.execute(_UPSERT_CRYPTO_SQL, (
+                    symbol, topic_id, is_active, availability,
+                    hyperliquid_available, allora_available,
+                    last_price, volume_24h
+                ))
             
-            conn.commit()
-            status_text = "ACTIVE" if is_active else "INACTIVE"
-            print(f"{Fore.GREEN}Updated crypto config for {symbol}: {status_text}{Style.RESET_ALL}")
-            logger.info(f"Updated crypto config: {symbol} -> {status_text}")
-            return True
+                conn.commit()
+                self._invalidate_caches()
             
-        except Exception as e:
-            print(f"{Fore.RED}Error updating crypto config for {symbol}: {e}{Style.RESET_ALL}")
-            logger.error(f"Error updating crypto config for {symbol}: {e}")
-            return False
-        finally:
-            conn.close()
+            except Exception as e:
+                conn.rollback()
+                print(f"{Fore.RED}Error updating crypto config for {symbol}: {e}{Style.RESET_ALL}")
+                logger.error(f"Error updating crypto config for {symbol}: {e}")
+                return False
+        
+        # Console output happens after the connection lock is released
+        status_text = "ACTIVE" if is_active else "INACTIVE"
+        print(f"{Fore.GREEN}Updated crypto config for {symbol}: {status_text}{Style.RESET_ALL}")
+        logger.info(f"Updated crypto config: {symbol} -> {status_text}")
+        return True
+    
+    def bulk_upsert_crypto_configs(self, rows):
+        """Insert or update many crypto configurations in a single transaction
+        
+        Args:
+            rows: dicts with update_crypto_config's arguments as keys;
+                  flags default to False, prices to None
+        
+        Returns:
+            Number of rows written, or 0 on error
+        """
+        if not rows:
+            return 0
+        
+        params = [
+            (row['symbol'], row['topic_id'], row.get('is_active', False), row['availability'],
+             row.get('hyperliquid_available', False), row.get('allora_available', False),
+             row.get('last_price'), row.get('volume_24h'))
+            for row in rows
+        ]
+        
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
+        
+            try:
+                # One INSERT ... VALUES (...),(...) per chunk; full chunks share
+                # the same SQL text and so the same prepared statement
+                for start in range(0, len(params), _UPSERT_CRYPTO_CHUNK):
+                    chunk = params[start:start + _UPSERT_CRYPTO_CHUNK]
+                    cursor.execute(
+                        self._bulk_upsert_sql(len(chunk)),
+                        [value for row in chunk for value in row]
+                    )
+            
+                conn.commit()
+                self._invalidate_caches()
+                logger.info(f"Bulk upserted {len(params)} crypto configs")
+                return len(params)
+            
+            except Exception as e:
+                conn.rollback()
+                print(f"{Fore.RED}❌ Error in bulk crypto config update: {e}{Style.RESET_ALL}")
+                logger.error(f"Error in bulk crypto config update: {e}")
+                return 0
+    
+    @staticmethod
+    def _bulk_upsert_sql(row_count):
+        """Multi-row upsert into crypto_configs for row_count rows"""
+        placeholders = ", ".join("?" * len(_UPSERT_CRYPTO_COLUMNS))
+        values = ",\n".join([f"({placeholders}, {LOCAL_NOW_SQL})"] * row_count)
+        return f"""
+            INSERT INTO crypto_configs 
+            ({', '.join(_UPSERT_CRYPTO_COLUMNS)}, updated_at)
+            VALUES {values}
+            {_UPSERT_CRYPTO_CONFLICT_SQL}
+        """
     
     def activate_crypto(self, symbol):
         """Activate a cryptocurrency for monitoring"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                UPDATE crypto_configs 
-                SET is_active = TRUE, updated_at = ?
-                WHERE symbol = ?
-            """, (datetime.now(), symbol))
-            
-            if cursor.rowcount > 0:
+            try:
+                cursor.execute(_SET_CRYPTO_ACTIVE_SQL, (True, symbol))
+                # Commit even when nothing matched so the shared connection
+                # isn't left holding an open write transaction
                 conn.commit()
-                print(f"{Fore.GREEN}✅ Activated crypto: {symbol}{Style.RESET_ALL}")
-                logger.info(f"Activated crypto: {symbol}")
-                return True
-            else:
-                print(f"{Fore.YELLOW}⚠️ Crypto {symbol} not found in configs{Style.RESET_ALL}")
-                logger.warning(f"Crypto not found for activation: {symbol}")
-                return False
+                self._invalidate_caches()
+                found = cursor.rowcount > 0
                 
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error activating crypto {symbol}: {e}{Style.RESET_ALL}")
-            logger.error(f"Error activating crypto {symbol}: {e}")
+            except Exception as e:
+                conn.rollback()
+                print(f"{Fore.RED}❌ Error activating crypto {symbol}: {e}{Style.RESET_ALL}")
+                logger.error(f"Error activating crypto {symbol}: {e}")
+                return False
+        
+        # Console output happens after the connection lock is released
+        if found:
+            print(f"{Fore.GREEN}✅ Activated crypto: {symbol}{Style.RESET_ALL}")
+            logger.info(f"Activated crypto: {symbol}")
+            return True
+        else:
+            print(f"{Fore.YELLOW}⚠️ Crypto {symbol} not found in configs{Style.RESET_ALL}")
+            logger.warning(f"Crypto not found for activation: {symbol}")
             return False
-        finally:
-            conn.close()
     
     def deactivate_crypto(self, symbol):
         """Deactivate a cryptocurrency from monitoring"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                UPDATE crypto_configs 
-                SET is_active = FALSE, updated_at = ?
-                WHERE symbol = ?
-            """, (datetime.now(), symbol))
-            
-            if cursor.rowcount > 0:
+            try:
+                cursor.execute(_SET_CRYPTO_ACTIVE_SQL, (False, symbol))
+                # Commit even when nothing matched so the shared connection
+                # isn't left holding an open write transaction
                 conn.commit()
-                print(f"{Fore.YELLOW}🔴 Deactivated crypto: {symbol}{Style.RESET_ALL}")
-                logger.info(f"Deactivated crypto: {symbol}")
-                return True
-            else:
-                print(f"{Fore.YELLOW}⚠️ Crypto {symbol} not found in configs{Style.RESET_ALL}")
-                logger.warning(f"Crypto not found for deactivation: {symbol}")
-                return False
+                self._invalidate_caches()
+                found = cursor.rowcount > 0
                 
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error deactivating crypto {symbol}: {e}{Style.RESET_ALL}")
-            logger.error(f"Error deactivating crypto {symbol}: {e}")
+            except Exception as e:
+                conn.rollback()
+                print(f"{Fore.RED}❌ Error deactivating crypto {symbol}: {e}{Style.RESET_ALL}")
+                logger.error(f"Error deactivating crypto {symbol}: {e}")
+                return False
+        
+        # Console output happens after the connection lock is released
+        if found:
+            print(f"{Fore.YELLOW}🔴 Deactivated crypto: {symbol}{Style.RESET_ALL}")
+            logger.info(f"Deactivated crypto: {symbol}")
+            return True
+        else:
+            print(f"{Fore.YELLOW}⚠️ Crypto {symbol} not found in configs{Style.RESET_ALL}")
+            logger.warning(f"Crypto not found for deactivation: {symbol}")
             return False
-        finally:
-            conn.close()
+
+    def set_cryptos_active(self, updates):
+        """Activate/deactivate several cryptocurrencies in a single transaction
+        
+        Args:
+            updates: {symbol: should_activate}
+        
+        Returns:
+            List of symbols found in crypto_configs and updated
+        """
+        if not updates:
+            return []
+        
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
+        
+            try:
+                # Resolve which symbols exist with one lookup instead of per-row checks
+                symbols = list(updates.keys())
+                placeholders = ",".join("?" * len(symbols))
+                cursor.execute(f"""
+                    SELECT symbol FROM crypto_configs
+                    WHERE symbol IN ({placeholders})
+                """, symbols)
+                existing = {row[0] for row in cursor.fetchall()}
+            
+                rows = [(bool(should_activate), symbol)
+                        for symbol, should_activate in updates.items() if symbol in existing]
+            
+                cursor.executemany(_SET_CRYPTO_ACTIVE_SQL, rows)
+                conn.commit()
+                self._invalidate_caches()
+            
+                missing = [symbol for symbol in symbols if symbol not in existing]
+                if missing:
+                    logger.warning(f"Cryptos not found for batch update: {', '.join(missing)}")
+                logger.info(f"Batch updated {len(rows)} crypto configs")
+                return [row[1] for row in rows]
+            
+            except Exception as e:
+                conn.rollback()
+                print(f"{Fore.RED}❌ Error in batch crypto update: {e}{Style.RESET_ALL}")
+                logger.error(f"Error in batch crypto update: {e}")
+                return []
 
     # ===== BOT COMMAND METHODS (File-based Queue) =====
     
     def add_bot_command(self, command_type, command_data=None):
-        """Creates a command file for the bot to execute."""
+        """Queues a command file for the bot to execute.
+        
+        The file is written by the shared command writer thread;
+        flush_commands() waits for it.
+        """
         try:
-            command_dir = os.path.join(self.project_root, "tmp", "commands", "pending")
-            os.makedirs(command_dir, exist_ok=True)
-
             command_id = str(uuid.uuid4())
-            file_path = os.path.join(command_dir, f"{command_id}.json")
 
             command_content = {
                 "id": command_id,
@@ -269,11 +536,11 @@ class DatabaseManager:
                 "timestamp": datetime.now().isoformat()
             }
 
-            with open(file_path, "w") as f:
-                json.dump(command_content, f)
-
-            print(f"📨 Fichier de commande créé : {file_path}")
-            logger.info(f"Command file created: {file_path}")
+            # Serialized here so that bad command data fails in the caller
+            payload = dumps_bytes(command_content)
+            if _command_writer is None:
+                _start_command_writer()
+            _command_queue.put_nowait((self._command_dir, command_type, command_id, payload))
             return command_id
 
         except Exception as e:
@@ -281,6 +548,10 @@ class DatabaseManager:
             logger.error(f"Error creating command file for {command_type}: {e}")
             return None
 
+    def flush_commands(self):
+        """Block until every queued command file has been written"""
+        flush_commands()
+
     def get_pending_commands(self):
         """
         DEPRECATED: This method is no longer used with the file-based queue.
@@ -308,48 +579,62 @@ class DatabaseManager:
     # ===== DATABASE STATISTICS =====
     
     def get_database_stats(self):
-        """Get database statistics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Get database statistics (cached for STATS_CACHE_TTL seconds)"""
+        cached_at, cached_stats = self._stats_cache
+        if cached_stats is not None and time.monotonic() - cached_at < self.STATS_CACHE_TTL:
+            return dict(cached_stats)
         
-        try:
-            stats = {}
-            
-            # Crypto configs count
-            cursor.execute("SELECT COUNT(*) FROM crypto_configs")
-            stats['total_cryptos'] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM crypto_configs WHERE is_active = TRUE")
-            stats['active_cryptos'] = cursor.fetchone()[0]
-            
-            # Commands count
-            cursor.execute("SELECT COUNT(*) FROM bot_commands WHERE status = 'PENDING'")
-            stats['pending_commands'] = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM bot_commands WHERE status = 'EXECUTED'")
-            stats['executed_commands'] = cursor.fetchone()[0]
-            
-            return stats
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.cursor()
+        
+            try:
+                # Crypto configs count, in one round-trip
+                total_cryptos, active_cryptos = cursor.execute("""
+                    SELECT (SELECT COUNT(*) FROM crypto_configs),
+                           (SELECT COUNT(*) FROM crypto_configs WHERE is_active = TRUE)
+                """).fetchone()
             
-        except Exception as e:
-            logger.error(f"Error getting database stats: {e}")
-            return {}
-        finally:
-            conn.close()
+            except Exception as e:
+                logger.error(f"Error getting database stats: {e}")
+                return {}
+        
+        # Count the command files this manager has queued, too
+        self.flush_commands()
+        stats = {
+            'total_cryptos': total_cryptos,
+            'active_cryptos': active_cryptos,
+            # Commands count (file-based queue)
+            'pending_commands': self._count_command_files("pending"),
+            'executed_commands': self._count_command_files("processed"),
+        }
+        self._stats_cache = (time.monotonic(), stats)
+        return dict(stats)
+    
+    def _count_command_files(self, state):
+        """Number of command files in tmp/commands/<state>"""
+        try:
+            with os.scandir(os.path.join(self.project_root, "tmp", "commands", state)) as entries:
+                return sum(1 for entry in entries if entry.name.endswith(".json"))
+        except FileNotFoundError:
+            return 0
 
     # ===== BACKWARD COMPATIBILITY METHODS =====
     
-    def log_trade(self, trade_data):
-        """Backward compatibility - delegate to ActivityLogger"""
+    def _get_activity_logger(self):
+        """ActivityLogger for this database, created once and reused"""
         # Import here to avoid circular imports
         from database.activity_logger import ActivityLogger
         
-        activity_logger = ActivityLogger(self.db_path)
-        return activity_logger.log_trade(trade_data)
+        activity_logger = self._activity_logger
+        if activity_logger is None or activity_logger.db_path != self.db_path:
+            activity_logger = self._activity_logger = ActivityLogger(self.db_path)
+        return activity_logger
+    
+    def log_trade(self, trade_data):
+        """Backward compatibility - delegate to ActivityLogger"""
+        return self._get_activity_logger().log_trade(trade_data)
     
     def update_trade_result(self, trade_id, exit_price, profit_loss, result):
         """Backward compatibility - delegate to ActivityLogger"""
-        from database.activity_logger import ActivityLogger
-        
-        activity_logger = ActivityLogger(self.db_path)
-        return activity_logger.update_trade_result(trade_id, exit_price, profit_loss, result)
\ No newline at end of file
+        return self._get_activity_logger().update_trade_result(trade_id, exit_price, profit_loss, result)
\ No newline at end of file
@@ -0,0 +1,32 @@
+"""
+JSON encoding for TEXT columns and command files, using orjson when installed
+"""
+
+try:
+    import orjson
+except ImportError:  # orjson is only required by the dashboard
+    orjson = None
+    import json
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj):
+        """Serialize obj to a JSON str"""
+        return orjson.dumps(obj, default=str, option=_OPTIONS).decode()
+
+    def dumps_bytes(obj):
+        """Serialize obj to UTF-8 JSON bytes, for writing straight to a file"""
+        return orjson.dumps(obj, default=str, option=_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(obj):
+        """Serialize obj to a JSON str"""
+        return json.dumps(obj, default=str)
+
+    def dumps_bytes(obj):
+        """Serialize obj to UTF-8 JSON bytes, for writing straight to a file"""
+        return dumps(obj).encode()
+
+    loads = json.loads
@@ -55,7 +55,10 @@ def initialize_database(db_path: str, cryptos: List[str]):
     }
     
     try:
-        conn = sqlite3.connect(db_path)
+        from database.connection import configure_connection
+        
+        # WAL and the other connection pragmas used by the bot
+        conn = configure_connection(sqlite3.connect(db_path))
         cursor = conn.cursor()
         
         # Create tables if they don't exist
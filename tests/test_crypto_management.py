@@ -219,6 +219,30 @@ class TestDatabaseCryptoOperations(unittest.TestCase):
         active_cryptos = self.db.get_active_cryptos()
         self.assertNotIn('BTC', active_cryptos)
     
+    def test_batch_crypto_activation(self):
+        """Test activating/deactivating several cryptos in one transaction"""
+        self.db.add_crypto_config('BTC', 14, 'both')
+        self.db.add_crypto_config('ETH', 13, 'allora')
+        self.db.add_crypto_config('SOL', 3, 'both')
+        self.db.activate_crypto('SOL')
+        
+        updated = self.db.set_cryptos_active({'BTC': True, 'ETH': True, 'SOL': False, 'UNKNOWN': True})
+        
+        self.assertEqual(sorted(updated), ['BTC', 'ETH', 'SOL'])
+        self.assertEqual(self.db.get_active_cryptos(), {'BTC': 14, 'ETH': 13})
+        self.assertEqual(self.db.set_cryptos_active({}), [])
+
+    def test_bulk_upsert_crypto_configs(self):
+        """Test upserting more configs than fit in one multi-row statement"""
+        self.db.add_crypto_config('BTC', 14, 'both')
+        rows = [{'symbol': f'TOKEN{i}', 'topic_id': i, 'availability': 'allora'} for i in range(250)]
+        rows.append({'symbol': 'BTC', 'topic_id': 14, 'availability': 'both', 'is_active': True})
+
+        self.assertEqual(self.db.bulk_upsert_crypto_configs(rows), 251)
+        self.assertEqual(len(self.db.get_crypto_configs()), 251)
+        self.assertEqual(self.db.get_active_cryptos(), {'BTC': 14})
+        self.assertEqual(self.db.bulk_upsert_crypto_configs([]), 0)
+    
     def test_bot_command_operations(self):
         """Test bot command database operations"""
         # Add command
@@ -235,6 +259,37 @@ class TestDatabaseCryptoOperations(unittest.TestCase):
         pending = self.db.get_pending_commands()
         self.assertEqual(len(pending), 0)
     
+    def test_cached_configs_see_other_connection_writes(self):
+        """Test cached config reads pick up changes made through another manager"""
+        self.db.add_crypto_config('BTC', 14, 'both')
+        self.assertEqual(self.db.get_active_cryptos(), {})
+        self.assertFalse(self.db.get_crypto_configs()[0]['is_active'])
+
+        other = DatabaseManager()
+        other.db_path = self.temp_db.name
+        other.activate_crypto('BTC')
+        other.close()
+
+        self.assertEqual(self.db.get_active_cryptos(), {'BTC': 14})
+        self.assertTrue(self.db.get_crypto_configs()[0]['is_active'])
+
+    def test_bot_command_file_written(self):
+        """Test queued bot commands land in the pending directory"""
+        # Never write into the project's tmp/commands, which a running bot reads
+        command_root = tempfile.TemporaryDirectory()
+        self.addCleanup(command_root.cleanup)
+        self.db._command_dir = os.path.join(command_root.name, "pending")
+
+        command_id = self.db.add_bot_command('ACTIVATE_CRYPTO', {'symbol': 'BTC'})
+        self.db.flush_commands()
+
+        file_path = os.path.join(self.db._command_dir, f"{command_id}.json")
+        with open(file_path) as f:
+            command = json.load(f)
+        self.assertEqual(command['command_type'], 'ACTIVATE_CRYPTO')
+        self.assertEqual(command['data'], {'symbol': 'BTC'})
+        self.assertFalse(os.path.exists(f"{file_path}.tmp"))
+
     def test_crypto_availability_tracking(self):
         """Test crypto availability tracking"""
         # Add cryptos with different availability